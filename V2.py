@@ -1,15 +1,26 @@
-import csv
-from datetime import datetime
-from gtts import gTTS
-from mutagen.mp3 import MP3
-
-from controller import Robot, Camera, GPS
-import time
+from controller import Robot
 import math
 import random
 import json
 import os
 
+from behaviour_scheduler import BehaviourScheduler
+from camera_view import CENTRE_ROI
+from colour_lut import ColourLUT
+from motion_health import MotionHealthMonitor
+from motion_model import DynamicWindowPlanner, HeadingEstimator, PurePursuit, WHEEL_RADIUS
+from occupancy_grid import OccupancyGrid
+from path_journal import PathJournal
+from path_planner import DStarLite, path_to_waypoints
+from path_replay import PathReplay, distance_to_segment, replay_waypoints
+from route_learning import TrajectoryLog, simplify_route
+from sensor_frame import SensorFrame
+from speed_governor import SpeedGovernor
+from tour_planner import MapDistance, plan_tour
+from victim_candidates import extract_candidates
+from victim_classifier import VictimClassifier
+from victim_reporter import VictimReporter
+
 # Constants
 HOLE_COLOR_THRESHOLD = 90       # Dark colors for holes
 TRAP_COLOR_THRESHOLD = (200, 100, 50)  # RGB range for orange traps
@@ -20,6 +31,14 @@ TRAP_BACK_DURATION = 25.0       # Seconds to move back from trap
 HOLE_PAUSE_TIME = 1             # Seconds to pause after detecting hole
 SHADOW_THRESHOLD = 0.15         # Seconds to confirm hole
 RIGHT_MOVE_DURATION = 2.0       # Seconds to move right after hole
+HOLE_CLEAR_DISTANCE = 0.06      # Hole back-off ends early once this far back on a normal floor [m]
+TRAP_CLEAR_DISTANCE = 0.12      # Trap escape ends early once a tile away on a normal floor [m]
+
+# Behaviour Scheduler Constants (lower runs first and pre-empts higher)
+PRIORITY_TRAP = 0
+PRIORITY_HOLE = 1
+PRIORITY_RECOVERY = 2
+PRIORITY_VICTIM = 3
 
 # Obstacle Avoidance Constants
 OBSTACLE_THRESHOLD = 80         # Distance to consider obstacle
@@ -41,6 +60,33 @@ WALL_B_MIN = 120                # Minimum blue value for wall
 WALL_R_MAX = 80                 # Maximum red value
 WALL_G_MAX = 140                # Maximum green value
 VICTIM_THRESHOLD = 200          # Minimum RGB values for white victims
+WALL_ROI = CENTRE_ROI           # Camera region checked for wall colour
+WALL_PIXEL_FRACTION = 0.5       # Share of WALL_ROI pixels in wall colour that means a wall ahead
+
+# Colour Lookup Table: the thresholds above as (class, lowest rgb, highest rgb) boxes,
+# calibration samples in COLOUR_SAMPLES_FILE add tile types such as swamp and checkpoint
+COLOUR_RULES = {
+    'floor': [
+        ('hole', (0, 0, 0), (HOLE_COLOR_THRESHOLD - 1,) * 3),
+        ('trap', (TRAP_COLOR_THRESHOLD[0] + 1, TRAP_COLOR_THRESHOLD[1] + 1, 0), (255, 255, TRAP_COLOR_THRESHOLD[2] - 1)),
+    ],
+    'camera': [
+        ('wall', (0, 0, WALL_B_MIN + 1), (WALL_R_MAX - 1, WALL_G_MAX - 1, 255)),
+        ('victim', (VICTIM_THRESHOLD + 1,) * 3, (255, 255, 255)),
+    ],
+}
+COLOUR_SAMPLES_FILE = "colour_samples.json"
+
+# Victim Classifier Constants
+LABELS_FILENAME = "labels.txt"
+VICTIM_LABEL_REPORTS = {        # Classifier letter -> (type_code, hazard_tag) for report_victim
+    'H': ('H', None),
+    'S': ('S', None),
+    'U': ('U', None),
+    'F': ('U', 'Flammable Gas'),    # Hazmat signs are reported as a phrases.json victim type plus the hazard
+    'P': ('U', 'Poison'),
+}
+VICTIM_DEFAULT_REPORT = ('U', None)         # Until the classifier is ready, or when it is unsure
 WALL_FOLLOW_DISTANCE = 60       # Ideal distance from wall
 VICTIM_PAUSE_TIME = 3.0         # Time to pause when victim found
 WALL_LOST_TIMEOUT = 2.0         # Time before considering wall lost
@@ -49,7 +95,10 @@ WALL_LOST_TIMEOUT = 2.0         # Time before considering wall lost
 #TARGET_X = -0.48
 #TARGET_Z = 0.25
 POSITION_TOLERANCE = 0.05       # How close we need to get to target
-NAVIGATION_SPEED = 5.0          # Base speed for navigation
+TARGET_MAX_ATTEMPTS = 2         # Times an unreachable target is put back at the end of the tour
+REPLAN_BUDGET = 100             # Planner cell updates + expansions per control step (~15 ms)
+ROUTE_CHECK_CELLS = 6           # Cells ahead on the route that must be free to keep driving during a repair
+NAVIGATION_SPEED = 5.0          # Base speed for the DIRECTIONS table, route following runs up to the governor's cap
 DIRECTIONS = {
     'forward': (NAVIGATION_SPEED, NAVIGATION_SPEED),
     'left': (NAVIGATION_SPEED*0.3, NAVIGATION_SPEED),
@@ -61,11 +110,12 @@ DIRECTIONS = {
 STUCK_THRESHOLD = 0.01          # Minimum position change
 STUCK_TIME = 2.0                # Seconds before considering stuck
 MAX_STUCK_ATTEMPTS = 10         # Max recovery attempts
-POSITION_HISTORY_SIZE = 10      # Number of positions to track
-RECOVERY_MOVE_STEPS = 50        # Steps for recovery moves
+RECOVERY_MOVE_STEPS = 50        # Max steps for recovery moves
+RECOVERY_CLEAR_DISTANCE = 0.05  # A recovery move ends early once the robot has moved this far
 
 # Path Following Constants
 PATH_FILENAME = "robot_path.json"
+ROUTE_START_TOLERANCE = 0.1     # A learned route is only replayed from within this of where it started [m]
 
 class ErebusInference:
     def __init__(self, robot):
@@ -77,60 +127,55 @@ class ErebusInference:
         self.right_motor = self.robot.getDevice("wheel2 motor")
         self.left_motor.setPosition(float('inf'))
         self.right_motor.setPosition(float('inf'))
+
+        # GPS waypoints and front clearance for closed-loop replay
+        self.gps = self.robot.getDevice("gps")
+        self.gps.enable(self.timestep)
+        self.front_sensors = []
+        for name in ("ps0", "ps7", "ps1", "ps6"):
+            sensor = self.robot.getDevice(name)
+            sensor.enable(self.timestep)
+            self.front_sensors.append(sensor)
         
         # Initialize path data with default empty path
         self.path_data = {'path': []}
         self.path_index = 0
         self.current_action = None
         self.action_steps_remaining = 0
+        self.trajectory = TrajectoryLog()
         
         # Get the absolute path to the controller directory
         controller_dir = os.path.dirname(os.path.abspath(__file__))
         self.path_file = os.path.join(controller_dir, PATH_FILENAME)
 
-        # Try to load path, create new file if not exists
+        # Load the recorded path: JSON snapshot (legacy robot_path.json works too) plus the append-only journal
         try:
-            if os.path.exists(self.path_file):
-                with open(self.path_file, 'r') as f:
-                    self.path_data = json.load(f)
-                print(f"Successfully loaded path from {self.path_file}")
-            else:
-                # Create new empty path file
-                with open(self.path_file, 'w') as f:
-                    json.dump(self.path_data, f)
-                print(f"Created new path file at {self.path_file}")
+            self.journal = PathJournal(self.path_file)
+            self.path_data = {'path': self.journal.actions}
+            print(f"Loaded {len(self.journal.actions)} path actions from {self.path_file}")
         except Exception as e:
             print(f"Error handling path file: {e}")
-            # Continue with empty path data
+            # Continue with empty path data, recording starts a new snapshot
+            self.journal = PathJournal(self.path_file, load=False)
+            self.path_data = {'path': self.journal.actions}
 
 
         # ------SEEMA------
 
-        self.speaker = self.robot.getDevice("speaker")
         self.language = 'en'
-        self.report_audio_end_time = 0 
-        self.audio_folder = r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/reports_audio"
-        os.makedirs(self.audio_folder, exist_ok=True)
-        # Clean the report audio folder at startup
-        for filename in os.listdir(self.audio_folder):
-            file_path = os.path.join(self.audio_folder, filename)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                print(f"Failed to delete {file_path}: {e}")
-        self.csv_path = r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/victim_report.csv"
-        self.reported_hashes = set()
-        with open(r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/phrases.json", "r") as f:
-            self.phrases_data = json.load(f)
-        # if not os.path.exists(self.csv_path):
-        with open(self.csv_path, mode='w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["X (m)", "Z (m)", "Type", "Priority", "Hazard", "Proximity (m)", "Timestamp", "Area_Code", "Urgency_Message", "Zone"])
+        self.reporter = VictimReporter(
+            self.robot,
+            phrases_path=r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/phrases.json",
+            audio_folder=r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/reports_audio",
+            csv_path=r"D:/SHU/AI_RDP/erebus-25.0.0 (1)/erebus-25.0.0/reports/victim_report.csv",
+            language=self.language)
 
     def get_position(self):
-        gps = self.robot.getDevice("gps")
-        return gps.getValues()[0], gps.getValues()[2]
+        values = self.gps.getValues()
+        return values[0], values[2]
+
+    def front_clearance(self):
+        return min(sensor.getValue() for sensor in self.front_sensors)
     
     def run_path_following(self):
         print("Starting path following mode")
@@ -142,87 +187,63 @@ class ErebusInference:
     def report_victim(self, x_cm, z_cm, type_code, hazard_tag, urgency_msg,voice_message, victim_count):
         print(f"---"*20)
         print('Victim_Count:', victim_count)
-        # with open(self.csv_path, mode='a', newline='') as file:
-        #     writer = csv.writer(file)
-        #     writer.writerow([
-        #         x_m, z_m, type_code, priority, hazard_tag or "None", proximity_m, timestamp, area_code, urgency_msg, zone
-        #     ])
-        x_m = round(x_cm / 100.0, 2)
-        z_m = round(z_cm / 100.0, 2)
-        pos_hash = f"{x_m}_{z_m}_{type_code}"
-
-        if pos_hash in self.reported_hashes:
-            robot_x, robot_z = self.get_position()
-            proximity_m = round(math.sqrt((x_m - robot_x) ** 2 + (z_m - robot_z) ** 2), 2)
-            print(f"[SKIPPED] Already reported: {type_code} at ({x_m} m, {z_m} m) | Distance: {proximity_m} m")
-            return
+        # Dedupe, CSV/binary logging and speech are handled by the shared reporter
+        return self.reporter.report_victim(x_cm, z_cm, type_code, hazard_tag, victim_count)
+
+    def set_language(self, language):
+        """Switch report language at runtime"""
+        self.language = language
+        self.reporter.set_language(language)
 
-        self.reported_hashes.add(pos_hash)
-        robot_x, robot_z = self.get_position()
-        proximity_m = round(math.sqrt((x_m - robot_x) ** 2 + (z_m - robot_z) ** 2), 2)
-
-        def classify_priority(type_code):
-            entry = self.phrases_data["priorities"].get(type_code, self.phrases_data["priorities"]["S"])
-            label = entry["label"]
-            messages = entry["voice_lines"]
-            urgency_msg = entry["urgency"]
-            return label, random.choice(messages), urgency_msg
-
-        def hazard_phrase(hazard_tag):
-            return self.phrases_data["hazards"].get(hazard_tag, "")
-
-        priority, message_line, urgency_msg = classify_priority(type_code)
-        timestamp = datetime.now().strftime("%m/%d/%Y %H:%M")
-        area_code = f"Area_Code{victim_count}"
-        zone = f"Zone-{(victim_count % 3) + 1}"
-
-        print(f"[COGNITIVE] Victim at ({x_m} m, {z_m} m) → {priority}")
-        print(f"[DISTANCE] Proximity: {proximity_m} meters")
-        if hazard_tag:
-            print(f"[HAZARD] {hazard_tag} detected")
-
-        with open(self.csv_path, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([x_m, z_m, type_code, priority, hazard_tag or "None", proximity_m, timestamp, area_code, urgency_msg, zone])
-
-        voice_lines = [
-            f"{message_line} Victim located at {x_m} and {z_m} meters.",
-            f"Classification: {priority}.",
-            f"Distance from robot: {proximity_m} meters.",
-            hazard_phrase(hazard_tag),
-            urgency_msg
-        ]
-        voice_message = " ".join([line for line in voice_lines if line])
-
-        mp3_path = os.path.join(self.audio_folder, f"report_{victim_count}.mp3")
-        tts = gTTS(text=voice_message, lang=self.language)
-        tts.save(mp3_path)
-        audio = MP3(mp3_path)
-        duration = audio.info.length
-        self.speaker.playSound(self.speaker, self.speaker, mp3_path, 1.0, 1.0, 0.0, False)
-        self.report_audio_end_time = self.robot.getTime() + duration
-        # time.sleep(duration)
-
-        # ----SHEEMA
+    def close(self):
+        """Write out buffered reports, stop the speech worker and compact the path journal"""
+        self.reporter.close()
+        self.journal.close()
 
     def save_path(self):
-        """Save the current path data to the JSON file"""
+        """Compact the path journal into the JSON snapshot"""
         try:
-            with open(self.path_file, 'w') as f:
-                json.dump(self.path_data, f, indent=2)
+            self.journal.compact()
             print(f"Path successfully saved to {self.path_file}")
             return True
         except Exception as e:
             print(f"Error saving path: {e}")
             return False
 
-    def add_path_action(self, action_type, steps):
-        """Add a new action to the path"""
-        self.path_data['path'].append({
-            'type': action_type,
-            'steps': steps
-        })
-        return self.save_path()
+    def add_path_action(self, action_type, steps, position=None):
+        """Add a new action to the path, repeats of the last action extend it
+
+        position is the GPS (x, z) where the action ended, the current GPS
+        position by default. It is the waypoint the replay tracks.
+        """
+        try:
+            x, z = position if position is not None else self.get_position()
+            if math.isnan(x) or math.isnan(z):
+                x = z = None    # No GPS fix yet
+            self.journal.add(action_type, steps, x, z)
+            return True
+        except Exception as e:
+            print(f"Error recording path action: {e}")
+            return False
+
+    def save_route(self, waypoints):
+        """Replace the recorded path with a learned waypoint route, replayed closed-loop on the next mission"""
+        if len(waypoints) < 2:
+            return False
+        # Step counts are only an estimate at the recorded 'F' speed, the replay tracks the waypoints
+        step_length = MAX_VELOCITY * 0.7 * WHEEL_RADIUS * self.timestep / 1000.0
+        actions = []
+        for (x0, z0), (x1, z1) in zip(waypoints, waypoints[1:]):
+            steps = max(1, round(math.hypot(x1 - x0, z1 - z0) / step_length))
+            actions.append({'type': 'F', 'steps': steps, 'x': round(x1, 4), 'z': round(z1, 4)})
+        try:
+            self.journal.replace(actions, start=waypoints[0])
+            self.path_data = {'path': self.journal.actions}
+            print(f"[ROUTE] Saved {len(actions)} waypoints to {self.path_file}")
+            return True
+        except Exception as e:
+            print(f"Error saving route: {e}")
+            return False
 
     def execute_movement(self, action_type):
         """Execute movement based on action type"""
@@ -239,30 +260,69 @@ class ErebusInference:
             self.left_motor.setVelocity(MAX_VELOCITY)
             self.right_motor.setVelocity(MAX_VELOCITY * 0.3)
 
+    def timed_report(self, last_report_time, victim_count):
+        """Timed victim report every 20 s, returns the updated (last_report_time, victim_count)"""
+        current_time = self.robot.getTime()
+        if current_time - last_report_time > 20:
+            x, z = self.get_position()
+            victim_types = ['U', 'S', 'H']
+            type_code = victim_types[(victim_count - 1) % len(victim_types)]
+            self.report_victim(x * 100, z * 100, type_code, None, None, None, victim_count)
+            return current_time, victim_count + 1
+        return last_report_time, victim_count
+
+    def set_velocity(self, left_speed, right_speed):
+        self.left_motor.setVelocity(left_speed)
+        self.right_motor.setVelocity(right_speed)
+
     def run(self):
-        # last_report_time = self.robot.getTime()
-        # victim_count = 1
-        # while self.robot.step(self.timestep) != -1 and not self.reached_target:
+        """Replay the recorded path, closed-loop when every action has a GPS waypoint"""
+        waypoints = replay_waypoints(self.path_data['path'])
+        if waypoints:
+            return self.run_closed_loop(waypoints)
+        print("Recorded path has no GPS waypoints, replaying by step count")
+        return self.run_open_loop()
+
+    def run_closed_loop(self, waypoints):
+        """Track the recorded waypoints with GPS/heading correction, faster where the way ahead is clear"""
         # -----SEEMA----
         last_report_time = self.robot.getTime()
         victim_count = 1
-        victim_types = ['U', 'S', 'H']
-        while self.robot.step(self.timestep) != -1 and not self.reached_target:
-            current_time = self.robot.getTime()
-
-            if current_time - last_report_time >20:
+        replay = PathReplay(waypoints)
+        print(f"[REPLAY] Tracking {len(waypoints)} waypoints")
+        while self.robot.step(self.timestep) != -1:
+            if replay.start is None and self.journal.start is not None:
                 x, z = self.get_position()
-                type_code = victim_types[(victim_count - 1) % len(victim_types)]
-                hazard_tag = None
-                urgency_msg = None
-                self.report_victim(x * 100, z * 100, type_code, hazard_tag, urgency_msg, victim_count)
-                victim_count += 1
-                last_report_time = current_time
+                if math.hypot(x - self.journal.start[0], z - self.journal.start[1]) > ROUTE_START_TOLERANCE:
+                    print(f"[REPLAY] Learned route starts at {self.journal.start}, robot is at ({x:.2f}, {z:.2f})")
+                    return False
+            last_report_time, victim_count = self.timed_report(last_report_time, victim_count)
+            self.reporter.tick()
+            x, z = self.get_position()
+            self.trajectory.record(x, z)
+            left, right = replay.command(x, z, self.robot.getTime(), self.front_clearance())
+            self.set_velocity(left, right)
+            if replay.done:
+                print("Path completed!")
+                return True
+            if replay.lost:
+                print(f"[REPLAY] {replay.deviation:.2f} m off the recorded route, giving up")
+                return False
+        return False
+
+    def run_open_loop(self):
+        """Replay actions by step count, for paths recorded without waypoints"""
+        # -----SEEMA----
+        last_report_time = self.robot.getTime()
+        victim_count = 1
+        while self.robot.step(self.timestep) != -1:
+            last_report_time, victim_count = self.timed_report(last_report_time, victim_count)
+            self.reporter.tick()
+            self.trajectory.record(*self.get_position())
             #  -------SHEEMA------
             if self.path_index >= len(self.path_data['path']):
                 print("Path completed!")
-                self.left_motor.setVelocity(0)
-                self.right_motor.setVelocity(0)
+                self.set_velocity(0, 0)
                 return True
             
             # Get current action
@@ -272,8 +332,7 @@ class ErebusInference:
                 self.action_steps_remaining = self.current_action['steps']
                 print(f"Executing {self.current_action['type']} for {self.current_action['steps']} steps")
             
-            # Execute current step
-            self.robot.step(self.timestep)
+            # The step in the loop header is this action's step, one step per recorded step
             self.action_steps_remaining -= 1
             
             # Check if action completed
@@ -311,6 +370,8 @@ class ErebusController:
         self.turn_start_time = 0
         self.current_target_index = 0
         self.total_targets = len(TARGET_POSITIONS)
+        self.tour = None                # Remaining target indices in visiting order, planned on the first GPS fix
+        self.target_attempts = {}
 
         # Wall following parameters
         self.wall_following = False
@@ -321,21 +382,50 @@ class ErebusController:
         # Target navigation parameters
         self.reached_target = False
         self.last_distance = float('inf')
+        # Heading from GPS + wheel commands, wheel speeds chosen by the kinematic model
+        self.heading_estimator = HeadingEstimator()
+        self.dwa = DynamicWindowPlanner(max_speed=MAX_VELOCITY)
+        # Route to the current target: D* Lite over the sensed occupancy grid, tracked by pure pursuit
+        self.occupancy = OccupancyGrid()
+        # One cached, search-budgeted distance for every tour plan, so reordering never stalls a step
+        self.map_distance = MapDistance(self.occupancy)
+        self.pursuit = PurePursuit(speed=MAX_VELOCITY, max_speed=MAX_VELOCITY)
+        self.route_planner = None
+        self.planned_path = None
+        self.planned_target = None
+        
+        # Manoeuvres run as generators, one timestep per main loop iteration
+        self.behaviours = BehaviourScheduler()
+        self.left_speed = 0.0
+        self.right_speed = 0.0
+        self.requested_speed = (0.0, 0.0)   # Wheel command before the governor's cap
+        
+        # Every wheel command is capped by clearance, recent collisions/stuck events and floor type
+        self.governor = SpeedGovernor(MAX_VELOCITY)
         
         # Enhanced stuck prevention
-        self.position_history = []
+        self.motion_health = MotionHealthMonitor()
         self.stuck_attempts = 0
         self.last_recovery_time = 0
         
         # Path following
         self.path_following = False
         self.path_follower = ErebusInference(self.robot)
+        # Driven GPS trajectory (replay included), saved as the route to replay once all targets are reached
+        self.trajectory = self.path_follower.trajectory
         
         # Initialize devices
         self.left_motor = self.robot.getDevice("wheel1 motor")
         self.right_motor = self.robot.getDevice("wheel2 motor")
         self.left_motor.setPosition(float('inf'))
         self.right_motor.setPosition(float('inf'))
+        # Wheel encoders are optional, without them slip is judged against the commanded speeds
+        self.left_encoder = self.robot.getDevice("wheel1 sensor")
+        self.right_encoder = self.robot.getDevice("wheel2 sensor")
+        self.has_encoders = self.left_encoder is not None and self.right_encoder is not None
+        if self.has_encoders:
+            self.left_encoder.enable(TIME_STEP)
+            self.right_encoder.enable(TIME_STEP)
         
         self.color_sensor = self.robot.getDevice("colour_sensor")
         self.color_sensor.enable(self.timestep)
@@ -357,114 +447,205 @@ class ErebusController:
         self.front_sensors = [self.distance_sensors[0], self.distance_sensors[7]]
         self.right_sensors = [self.distance_sensors[1], self.distance_sensors[2]]
         self.left_sensors = [self.distance_sensors[5], self.distance_sensors[6]]
+        
+        # Floor and camera colours are classified through a cached lookup table
+        controller_dir = os.path.dirname(os.path.abspath(__file__))
+        samples = {}
+        try:
+            with open(os.path.join(controller_dir, COLOUR_SAMPLES_FILE), 'r') as f:
+                samples = json.load(f)
+        except Exception as e:
+            print(f"[LUT] No colour calibration samples, thresholds only: {e}")
+        self.colour_lut = ColourLUT.load(controller_dir, COLOUR_RULES, samples)
+        # Letter classifier loads and warms up on its own thread, never inside a control step
+        self.victim_classifier = VictimClassifier(controller_dir, os.path.join(controller_dir, LABELS_FILENAME))
+        self.victim_classifier.start()
+        self._candidates = (None, [])   # (frame, victim candidates found in it)
+        
+        # Readings of the current step, refreshed by sense_motion() right after each robot.step
+        self.frame = None
+        self.capture_frame()
+
+    def capture_frame(self):
+        """Read every device once for this step"""
+        encoders = (self.left_encoder, self.right_encoder) if self.has_encoders else None
+        self.frame = SensorFrame.capture(self.robot, self.gps, self.distance_sensors,
+                                         self.color_sensor, self.camera, encoders)
+        return self.frame
 
     def get_color_values(self):
-        image = self.color_sensor.getImage()
-        return (self.color_sensor.imageGetRed(image, 1, 0, 0),
-                self.color_sensor.imageGetGreen(image, 1, 0, 0),
-                self.color_sensor.imageGetBlue(image, 1, 0, 0)) if image else (0, 0, 0)
+        return self.frame.colour
 
     def get_camera_color_values(self):
-        image = self.camera.getImage()
-        if image:
-            x, y = self.camera_width//2, self.camera_height//2
-            return (Camera.imageGetRed(image, self.camera_width, x, y),
-                    Camera.imageGetGreen(image, self.camera_width, x, y),
-                    Camera.imageGetBlue(image, self.camera_width, x, y))
-        return (0, 0, 0)
+        return self.frame.camera_centre()
 
     def get_position(self):
-        return self.gps.getValues()[0], self.gps.getValues()[2]
+        return self.frame.position
 
     def get_sensor_readings(self):
-        return {
-            'front_left': self.front_sensors[0].getValue(),
-            'front_right': self.front_sensors[1].getValue(),
-            'left': min(s.getValue() for s in self.left_sensors),
-            'right': min(s.getValue() for s in self.right_sensors)
-        }
+        return self.frame.readings()
 
     def distance_to_target(self, x, z):
         target_x, target_z = TARGET_POSITIONS[self.current_target_index]
         return math.sqrt((x - target_x)**2 + (z - target_z)**2)
+
+    def update_route(self, current_pos):
+        """Repair the route to the current target with what the sensors saw this step
+
+        Work is capped at REPLAN_BUDGET per call; an unfinished repair
+        resumes on the next step. Returns False while the robot should wait
+        for it because the old route is blocked just ahead.
+        """
+        start = self.occupancy.cell_of(*current_pos)
+        changed = self.occupancy.take_changes()
+        if self.planned_target != self.current_target_index:
+            target = TARGET_POSITIONS[self.current_target_index]
+            self.route_planner = DStarLite(self.occupancy, start, self.occupancy.cell_of(*target))
+            self.planned_target = self.current_target_index
+            self.planned_path = None
+            self.pursuit.set_path([target])
+        self.route_planner.update_start(start)
+        self.route_planner.update_cells(changed)
+        if not self.route_planner.compute(REPLAN_BUDGET):
+            ahead = (self.planned_path or [])[:ROUTE_CHECK_CELLS]
+            return not any(self.occupancy.is_blocked(cell) for cell in ahead[1:])
+        if self.route_planner.dirty:
+            cells = self.route_planner.path()
+            if cells is None:
+                self.defer_target(current_pos)
+                return False
+            self.set_route(cells)
+        return True
+
+    def order_targets(self, current_pos, remaining=None):
+        """Visit the remaining targets in the order that keeps the drive from here shortest"""
+        remaining = range(self.total_targets) if remaining is None else remaining
+        self.map_distance.allow()
+        self.tour = plan_tour(current_pos, TARGET_POSITIONS, self.map_distance, remaining)
+        if self.tour:
+            self.current_target_index = self.tour[0]
+        print(f"[TOUR] Visiting order: {' -> '.join(str(i + 1) for i in self.tour)}")
+
+    def defer_target(self, current_pos):
+        """The current target is walled off: reorder the rest and retry it last"""
+        target = self.current_target_index
+        self.target_attempts[target] = self.target_attempts.get(target, 0) + 1
+        print(f"[PLANNER] No route to target {target + 1} (attempt {self.target_attempts[target]})")
+        self.order_targets(current_pos, self.tour[1:])
+        if self.target_attempts[target] < TARGET_MAX_ATTEMPTS:
+            self.tour.append(target)
+        else:
+            print(f"[TOUR] Giving up on target {target + 1}")
+        if not self.tour:
+            print("All reachable targets visited!")
+            self.reached_target = True
+            return
+        self.current_target_index = self.tour[0]
+        # The old planner proved its target unreachable; a retry (or the next target) starts a fresh search
+        self.planned_target = None
+
+    def set_route(self, cells):
+        target = TARGET_POSITIONS[self.current_target_index]
+        self.planned_path = cells
+        waypoints = path_to_waypoints(self.occupancy, cells)
+        waypoints[-1] = target  # Finish on the exact target, not its cell centre
+        self.pursuit.set_path(waypoints)
+        print(f"[PLANNER] Route to target {self.current_target_index + 1}: {len(cells)} cells, {len(waypoints)} waypoints "
+              f"({self.route_planner.expansions} expansions so far)")
+
     def detect_obstacle(self):
         readings = self.get_sensor_readings()
         return readings['front_left'] > OBSTACLE_THRESHOLD or readings['front_right'] > OBSTACLE_THRESHOLD
 
-    def evaluate_move(self, direction):
-        x, z = self.get_position()
-        self.move(*DIRECTIONS[direction], steps=1)
-        new_x, new_z = self.get_position()
-        self.move(*DIRECTIONS['back'], steps=1)
-        return self.distance_to_target(new_x, new_z)
-
     def is_robot_stuck(self):
-        if len(self.position_history) < POSITION_HISTORY_SIZE:
+        if self.robot.getTime() - self.last_recovery_time <= STUCK_TIME:
             return False
-            
-        total_movement = 0
-        for i in range(1, len(self.position_history)):
-            dx = self.position_history[i][0] - self.position_history[i-1][0]
-            dz = self.position_history[i][1] - self.position_history[i-1][1]
-            total_movement += math.sqrt(dx**2 + dz**2)
-        
-        avg_movement = total_movement / (len(self.position_history)-1)
-        return avg_movement < STUCK_THRESHOLD and \
-               (self.robot.getTime() - self.last_recovery_time) > STUCK_TIME
+        health = self.motion_health.status()
+        return health.stuck or health.slip or health.oscillating
+
+    def drive(self, left_speed, right_speed, steps):
+        """Manoeuvre step: hold a wheel command for a number of timesteps"""
+        self.set_wheels(left_speed, right_speed)
+        for _ in range(steps):
+            yield
 
-    def execute_recovery_sequence(self):
+    def wait(self, duration):
+        """Manoeuvre step: keep the current wheel command for duration seconds"""
+        start_time = self.robot.getTime()
+        while self.robot.getTime() - start_time < duration:
+            yield
+
+    def recovery_move(self, left_speed, right_speed, steps=RECOVERY_MOVE_STEPS):
+        """Recovery manoeuvre that stops as soon as the robot has actually moved clear"""
+        start_x, start_z = self.get_position()
+        self.set_wheels(left_speed, right_speed)
+        for _ in range(steps):
+            yield
+            x, z = self.get_position()
+            if math.sqrt((x - start_x)**2 + (z - start_z)**2) > RECOVERY_CLEAR_DISTANCE:
+                return
+
+    def recovery_task(self):
         self.stuck_attempts += 1
         current_time = self.robot.getTime()
-        
-        # Try different strategies based on attempt count
-        if self.stuck_attempts % 4 == 0:
+        self.governor.note_event(current_time)
+        health = self.motion_health.status()
+        start_pos = self.get_position()
+        
+        # Pick the manoeuvre from the signal, then vary it by attempt count
+        if health.oscillating:
+            # Flapping between left and right: commit to one straight move
+            print(f"Recovery: Oscillation ({health.flips} turn flips) - committing forward")
+            yield from self.recovery_move(*DIRECTIONS['forward'])
+        elif health.slip:
+            # Wheels turn but the robot barely moves: back off the obstacle it is pushing
+            print(f"Recovery: Slip ({health.travelled:.3f} m of {health.expected:.3f} m) - backing off")
+            yield from self.recovery_move(*DIRECTIONS['back'])
+        elif self.stuck_attempts % 4 == 0:
             # Full rotation + forward
             print("Recovery: Full rotation + forward")
-            self.move(MAX_VELOCITY, -MAX_VELOCITY, steps=40)
-            self.move(*DIRECTIONS['forward'], steps=RECOVERY_MOVE_STEPS)
+            yield from self.drive(MAX_VELOCITY, -MAX_VELOCITY, 40)
+            yield from self.recovery_move(*DIRECTIONS['forward'])
         elif self.stuck_attempts % 3 == 0:
             # Strong left turn
             print("Recovery: Strong left turn")
-            self.move(MAX_VELOCITY*0.2, MAX_VELOCITY, steps=RECOVERY_MOVE_STEPS)
+            yield from self.recovery_move(MAX_VELOCITY*0.2, MAX_VELOCITY)
         elif self.stuck_attempts % 2 == 0:
             # Strong right turn
             print("Recovery: Strong right turn")
-            self.move(MAX_VELOCITY, MAX_VELOCITY*0.2, steps=RECOVERY_MOVE_STEPS)
+            yield from self.recovery_move(MAX_VELOCITY, MAX_VELOCITY*0.2)
         else:
             # Long backward + slight turn
             print("Recovery: Long backward + turn")
-            self.move(*DIRECTIONS['back'], steps=RECOVERY_MOVE_STEPS)
-            self.move(MAX_VELOCITY, MAX_VELOCITY*0.7, steps=20)
+            yield from self.recovery_move(*DIRECTIONS['back'])
+            yield from self.drive(MAX_VELOCITY, MAX_VELOCITY*0.7, 20)
         
         # Check if recovery worked
         new_pos = self.get_position()
-        movement = math.sqrt((new_pos[0]-self.position_history[-1][0])**2 + 
-                            (new_pos[1]-self.position_history[-1][1])**2)
+        movement = math.sqrt((new_pos[0]-start_pos[0])**2 + 
+                            (new_pos[1]-start_pos[1])**2)
         
         if movement > STUCK_THRESHOLD*5:
             print("Recovery successful!")
-            self.position_history = []
+            self.motion_health.reset()
             self.last_recovery_time = current_time
-            return True
+            self.last_distance = float('inf')
+            return
         
         if self.stuck_attempts >= MAX_STUCK_ATTEMPTS:
             print("Max recovery attempts reached - hard reset")
-            self.move(*DIRECTIONS['back'], steps=100)
-            self.move(MAX_VELOCITY, -MAX_VELOCITY, steps=60)
+            yield from self.drive(*DIRECTIONS['back'], 100)
+            yield from self.drive(MAX_VELOCITY, -MAX_VELOCITY, 60)
             self.stuck_attempts = 0
-            self.position_history = []
-            return False
-            
-        return False
+            self.motion_health.reset()
 
     def detect_hole(self):
         if self.in_hole_sequence or self.in_trap_sequence:
             return False
             
-        r, g, b = self.get_color_values()
         current_time = self.robot.getTime()
         
-        if all(c < HOLE_COLOR_THRESHOLD for c in (r, g, b)):
+        if self.floor_type() == 'hole':
             if self.hole_detection_start < 0:
                 self.hole_detection_start = current_time
             elif current_time - self.hole_detection_start > SHADOW_THRESHOLD:
@@ -474,73 +655,114 @@ class ErebusController:
         return False
 
     def detect_trap(self):
-        if self.in_hole_sequence or self.in_trap_sequence:
+        # A trap is more urgent than a hole, so it is still checked while avoiding one
+        if self.in_trap_sequence:
             return False
             
-        r, g, b = self.get_color_values()
-        return (r > TRAP_COLOR_THRESHOLD[0] and 
-                g > TRAP_COLOR_THRESHOLD[1] and 
-                b < TRAP_COLOR_THRESHOLD[2])
+        return self.floor_type() == 'trap'
 
     def detect_wall(self):
-        r, g, b = self.get_camera_color_values()
-        return (b > WALL_B_MIN and 
-                r < WALL_R_MAX and 
-                g < WALL_G_MAX)
+        view = self.frame.camera_view()
+        return view is not None and self.colour_lut.fraction(view.region(WALL_ROI), 'wall') >= WALL_PIXEL_FRACTION
+
+    def victim_candidates(self):
+        """Sign-sized white/hazmat blobs in the camera frame as classifier crops, extracted once per step"""
+        if self._candidates[0] is not self.frame:
+            view = self.frame.camera_view()
+            self._candidates = (self.frame, extract_candidates(view, self.colour_lut) if view is not None else [])
+        return self._candidates[1]
 
     def detect_victim(self):
-        r, g, b = self.get_camera_color_values()
-        return (r > VICTIM_THRESHOLD and 
-                g > VICTIM_THRESHOLD and 
-                b > VICTIM_THRESHOLD)
+        return bool(self.victim_candidates())
+
+    def floor_type(self):
+        """'normal', 'hole', 'trap', 'swamp' or 'checkpoint' under the colour sensor"""
+        return self.colour_lut.name(self.frame.colour, 'floor')
+
+    def on_normal_floor(self):
+        return self.floor_type() not in ('hole', 'trap')
+
+    def moved_from(self, start_pos):
+        x, z = self.get_position()
+        return math.sqrt((x - start_pos[0])**2 + (z - start_pos[1])**2)
 
-    def execute_hole_avoidance(self):
+    def hole_avoidance_task(self):
         print("HOLE DETECTED! Starting avoidance...")
         self.in_hole_sequence = True
-        
-        # 1. Immediate stop
-        self.stop()
-        
-        # 2. Pause for specified time
-        start_pause = self.robot.getTime()
-        while self.robot.getTime() - start_pause < HOLE_PAUSE_TIME:
-            self.robot.step(TIME_STEP)
-        
-        # 3. Move back
-        steps_completed = 0
-        self.move(-0.5 * MAX_VELOCITY, -0.5 * MAX_VELOCITY)
-        while steps_completed < HOLE_BACK_STEPS:
-            self.robot.step(TIME_STEP)
-            steps_completed += 1
-        
-        # 4. Move right
-        self.move(0.7 * MAX_VELOCITY, 0.3 * MAX_VELOCITY)
-        move_start = self.robot.getTime()
-        while self.robot.getTime() - move_start < RIGHT_MOVE_DURATION:
-            self.robot.step(TIME_STEP)
-        
-        # Complete
-        self.stop()
-        self.in_hole_sequence = False
-        self.hole_detection_start = -1
-        print("Hole avoidance complete")
+        try:
+            # 1. Immediate stop and pause
+            self.stop()
+            yield from self.wait(HOLE_PAUSE_TIME)
+            
+            # 2. Move back until clear of the hole (at most HOLE_BACK_STEPS)
+            start_pos = self.get_position()
+            self.set_wheels(-0.5 * MAX_VELOCITY, -0.5 * MAX_VELOCITY)
+            for _ in range(HOLE_BACK_STEPS):
+                yield
+                if self.moved_from(start_pos) > HOLE_CLEAR_DISTANCE and self.on_normal_floor():
+                    break
+            
+            # 3. Move right
+            self.set_wheels(0.7 * MAX_VELOCITY, 0.3 * MAX_VELOCITY)
+            yield from self.wait(RIGHT_MOVE_DURATION)
+            print("Hole avoidance complete")
+        finally:
+            self.stop()
+            self.in_hole_sequence = False
+            self.hole_detection_start = -1
 
-    def execute_trap_avoidance(self):
+    def trap_avoidance_task(self):
         print("TRAP DETECTED! Quick escape!")
         self.in_trap_sequence = True
-        
-        # Asymmetric backward movement
-        self.move(-0.3 * MAX_VELOCITY, -0.9 * MAX_VELOCITY)
-        
-        # Continue for duration
-        start_time = self.robot.getTime()
-        while self.robot.getTime() - start_time < TRAP_BACK_DURATION:
-            self.robot.step(TIME_STEP)
-        
-        # Complete
-        self.stop()
-        self.in_trap_sequence = False
-        print("Trap escape complete")
+        try:
+            # Asymmetric backward movement until a tile away on a normal floor (at most TRAP_BACK_DURATION)
+            start_pos = self.get_position()
+            start_time = self.robot.getTime()
+            self.set_wheels(-0.3 * MAX_VELOCITY, -0.9 * MAX_VELOCITY)
+            while self.robot.getTime() - start_time < TRAP_BACK_DURATION:
+                yield
+                if self.moved_from(start_pos) > TRAP_CLEAR_DISTANCE and self.on_normal_floor():
+                    break
+            print(f"Trap escape complete after {self.robot.getTime() - start_time:.1f}s")
+        finally:
+            self.stop()
+            self.in_trap_sequence = False
+
+    def victim_pause_task(self):
+        try:
+            self.stop()
+            yield from self.wait(VICTIM_PAUSE_TIME)
+            print("VICTIM REPORTED - CONTINUING")
+        finally:
+            self.stop()
+
+    def classify_victim(self):
+        """(type_code, hazard_tag) of the victim in view, from the letter classifier once it is ready"""
+        candidates = self.victim_candidates()
+        # Only the candidate crops are classified, as one batch
+        results = self.victim_classifier.classify([candidate.crop for candidate in candidates])
+        if results:
+            label, confidence = max(results, key=lambda result: result[1])
+            if label in VICTIM_LABEL_REPORTS:
+                print(f"[CLASSIFIER] {label} ({confidence:.2f}) from {len(candidates)} candidate(s)")
+                return VICTIM_LABEL_REPORTS[label]
+        return VICTIM_DEFAULT_REPORT
+
+    def check_victim(self):
+        """Report a victim in view, keeps running during manoeuvres"""
+        if not self.detect_victim():
+            self.victim_reported = False
+            return
+        if self.victim_reported:
+            return
+        print("VICTIM DETECTED! Reporting...")
+        x, z = self.get_position()
+        type_code, hazard_tag = self.classify_victim()
+        count = len(self.path_follower.reporter.victim_index) + 1
+        self.path_follower.report_victim(x * 100, z * 100, type_code, hazard_tag, None, None, count)
+        self.victim_reported = True
+        # The pause only happens if no hazard manoeuvre is running
+        self.behaviours.start("victim", self.victim_pause_task(), PRIORITY_VICTIM)
 
     def follow_wall(self):
         if not self.detect_wall():
@@ -567,91 +789,106 @@ class ErebusController:
         #     print("VICTIM REPORTED - CONTINUING")
         #     return True
 
-        # -------SEEMA--------
-        if self.detect_victim() and not self.victim_reported:
-            print("VICTIM DETECTED! Reporting...")
-            self.stop()
-            x, z = self.get_position()
-            # Assuming type_code and hazard_tag are determined based on context
-            type_code = 'U'  # Unknown, or set based on context
-            hazard_tag = 'Poission'
-            count = len(self.reported_hashes) + 1
-            self.report_victim(x * 100, z * 100, type_code, hazard_tag, count)
-            start_pause = self.robot.getTime()
-            while self.robot.getTime() - start_pause < VICTIM_PAUSE_TIME:
-                self.robot.step(TIME_STEP)
-            self.victim_reported = True
-            print("VICTIM REPORTED - CONTINUING")
-            return True
-        
-        self.victim_reported = False
+        # Victims are checked every step in check_victim()
         
         # Wall following logic (right wall)
         if self.wall_side == "right":
             if sensors['right'] < WALL_FOLLOW_DISTANCE:
-                self.move(MAX_VELOCITY * 0.3, MAX_VELOCITY)  # Turn left
+                self.set_wheels(MAX_VELOCITY * 0.3, MAX_VELOCITY)  # Turn left
             else:
-                self.move(MAX_VELOCITY, MAX_VELOCITY * 0.8)  # Parallel
+                self.set_wheels(MAX_VELOCITY, MAX_VELOCITY * 0.8)  # Parallel
         else:  # Left wall
             if sensors['left'] < WALL_FOLLOW_DISTANCE:
-                self.move(MAX_VELOCITY, MAX_VELOCITY * 0.3)  # Turn right
+                self.set_wheels(MAX_VELOCITY, MAX_VELOCITY * 0.3)  # Turn right
             else:
-                self.move(MAX_VELOCITY * 0.8, MAX_VELOCITY)  # Parallel
+                self.set_wheels(MAX_VELOCITY * 0.8, MAX_VELOCITY)  # Parallel
         
         return True
     
         # ------SHEEMA------
 
-    def move(self, left_speed, right_speed, steps=1):
+    def set_wheels(self, left_speed, right_speed):
+        """Command the motors without stepping (capped by the speed governor), the main loop advances time"""
+        self.requested_speed = (left_speed, right_speed)
+        left_speed, right_speed = self.governor.limit(left_speed, right_speed)
+        self.left_speed, self.right_speed = left_speed, right_speed
         self.left_motor.setVelocity(left_speed)
         self.right_motor.setVelocity(right_speed)
-        for _ in range(steps):
-            self.robot.step(TIME_STEP)
+        self.heading_estimator.set_command(left_speed, right_speed)
+        self.dwa.set_command(left_speed, right_speed)
+
+    def sense_motion(self):
+        """Per-step sensor capture, heading, motion-health and speed cap update, call once after every robot.step"""
+        self.capture_frame()
+        sensors = self.get_sensor_readings()
+        self.governor.update(min(sensors['front_left'], sensors['front_right']),
+                             min(sensors['left'], sensors['right']), self.floor_type(), self.frame.time)
+        if self.governor.limit(*self.requested_speed) != (self.left_speed, self.right_speed):
+            # A held manoeuvre command follows the cap as it changes
+            self.set_wheels(*self.requested_speed)
+        x, z = self.get_position()
+        self.heading_estimator.update(x, z, self.frame.time)
+        self.trajectory.record(x, z)
+        self.motion_health.record(x, z, self.left_speed, self.right_speed, self.frame.time, self.frame.encoders)
 
     def stop(self):
-        self.move(0, 0)
+        self.set_wheels(0, 0)
+
+    def learn_route(self):
+        """Simplify this mission's GPS trajectory and save it as the route for the next mission"""
+        line_of_sight = self.map_distance.line_of_sight
+        # Samples where targets were reached are anchors, loop cuts and shortcuts must keep them
+        waypoints = simplify_route(self.trajectory.points, line_of_sight, anchors=self.trajectory.anchors)
+        print(f"[ROUTE] {len(self.trajectory.points)} GPS samples simplified to {len(waypoints)} waypoints")
+        for target in TARGET_POSITIONS:
+            if len(waypoints) < 2 or min(distance_to_segment(*target, a, b)
+                                         for a, b in zip(waypoints, waypoints[1:])) > POSITION_TOLERANCE:
+                print(f"[ROUTE] Target {target} is off the learned route, keeping the previous path")
+                return False
+        return self.path_follower.save_route(waypoints)
 
     def navigate_to_target(self):
         current_pos = self.get_position()
-        self.position_history.append(current_pos)
-        if len(self.position_history) > POSITION_HISTORY_SIZE:
-            self.position_history.pop(0)
-        
+        if self.tour is None:
+            self.order_targets(current_pos)
         current_dist = self.distance_to_target(*current_pos)
         if current_dist < POSITION_TOLERANCE:
             print(f"Target {self.current_target_index + 1} reached at X:{current_pos[0]:.2f} Z:{current_pos[1]:.2f}")
             self.stop()
+            self.trajectory.mark(*current_pos)
             
-            self.current_target_index += 1
-            if self.current_target_index >= self.total_targets:
+            self.tour.pop(0)
+            if not self.tour:
                 print("All targets reached!")
                 self.reached_target = True
+                self.learn_route()
             else:
+                self.current_target_index = self.tour[0]
                 print(f"Moving to next target: {TARGET_POSITIONS[self.current_target_index]}")
                 self.last_distance = float('inf')
-                self.position_history = []
+                self.motion_health.reset()
             
             return True
         
         if self.is_robot_stuck():
-            print("Robot stuck - initiating recovery sequence")
-            if self.execute_recovery_sequence():
-                self.last_distance = float('inf')
-                return False
+            print(f"Robot stuck - initiating recovery sequence ({self.motion_health.status()})")
+            self.behaviours.start("recovery", self.recovery_task(), PRIORITY_RECOVERY)
+            return False
                 
-        # Normal navigation
-        best_direction = None
-        best_distance = float('inf')
-        
-        for direction in DIRECTIONS:
-            test_distance = self.evaluate_move(direction)
-            if test_distance < best_distance:
-                best_distance = test_distance
-                best_direction = direction
-        
-        if best_direction:
-            self.move(*DIRECTIONS[best_direction])
-            print(f"Moving {best_direction} (Distance: {best_distance:.2f})")
+        # Normal navigation: follow a D* Lite route around the walls sensed so far
+        heading = self.heading_estimator.update(*current_pos, self.robot.getTime())
+        if heading is None:
+            # No heading fix yet, the kinematic model drives straight until GPS gives one
+            left_speed, right_speed, _ = self.dwa.plan(
+                *current_pos, heading, TARGET_POSITIONS[self.current_target_index], TIME_STEP / 1000.0)
+        else:
+            self.occupancy.integrate_ranges(*current_pos, heading, self.frame.ranges)
+            if self.update_route(current_pos):
+                left_speed, right_speed = self.pursuit.command(*current_pos, heading)
+            else:
+                left_speed, right_speed = 0.0, 0.0   # Route ahead is blocked, wait for the repair
+        self.set_wheels(left_speed, right_speed)
+        print(f"Moving L:{left_speed:.2f} R:{right_speed:.2f} (Distance: {current_dist:.2f})")
         
         return False
 
@@ -683,41 +920,39 @@ class ErebusController:
         last_report_time = self.robot.getTime()
         victim_count = 1
         victim_types = ['U', 'S', 'H']
-        hazard_tag_list = ['Flammable Gas', 'Poission', 'Organic Peroxide', 'Corrosive']
-        
-        urgency_msg = None
-        count = len(self.path_follower.reported_hashes) + 1
-        # urgency_msg = self.path_follower.phrases_data["priorities"].get(type_code, {}).get("urgency", "No urgency message")
+        hazard_tag_list = ['Flammable Gas', 'Poison', 'Organic Peroxide', 'Corrosive']
 
         # Fall back to normal navigation
         while self.robot.step(TIME_STEP) != -1 and not self.reached_target:
+            self.sense_motion()
             # ------SEEMA---------
             current_time = self.robot.getTime()
             # Timed victim reporting
+            # Reports queue on the speaker scheduler, most urgent first, instead of waiting for silence
             if current_time - last_report_time > 20:
-                if current_time >= self.path_follower.report_audio_end_time:
-                    print(f"Reporting victim at time {current_time}")
-                    x, z = self.get_position()
-                    type_code = victim_types[(victim_count - 1) % len(victim_types)]
-                    hazard_tag = random.choice(hazard_tag_list)
-                    
-                
-                    self.path_follower.report_victim(x * 100, z * 100, type_code, hazard_tag, urgency_msg, None, victim_count)
-                    print(f"[DEBUG] Timed victim report triggered at {current_time}")
-                    victim_count += 1
-                    last_report_time = current_time
-                # else:
-                #     print("[DEBUG] Skipping report: previous audio still playing")
+                print(f"Reporting victim at time {current_time}")
+                x, z = self.get_position()
+                type_code = victim_types[(victim_count - 1) % len(victim_types)]
+                hazard_tag = random.choice(hazard_tag_list)
+
+                self.path_follower.report_victim(x * 100, z * 100, type_code, hazard_tag, None, None, victim_count)
+                print(f"[DEBUG] Timed victim report triggered at {current_time} | Speaker: {self.path_follower.reporter.speech.stats()}")
+                victim_count += 1
+                last_report_time = current_time
+            self.path_follower.reporter.tick()
 
             # --------SHEEMA----------
+            # Detection runs every step, also while a manoeuvre is in progress
             # Priority 1: Trap detection
-            if not self.in_trap_sequence and self.detect_trap():
-                self.execute_trap_avoidance()
-                continue
-                
+            if self.detect_trap():
+                self.behaviours.start("trap", self.trap_avoidance_task(), PRIORITY_TRAP)
             # Priority 2: Hole detection
-            if not self.in_hole_sequence and self.detect_hole():
-                self.execute_hole_avoidance()
+            elif self.detect_hole():
+                self.behaviours.start("hole", self.hole_avoidance_task(), PRIORITY_HOLE)
+            self.check_victim()
+            
+            # Advance the running manoeuvre (trap, hole, recovery or victim pause) by one step
+            if self.behaviours.tick():
                 continue
                 
             # Priority 3: Wall following
@@ -728,6 +963,8 @@ class ErebusController:
             # Normal operation - target navigation
             x_pos, z_pos = self.get_position()
             self.navigate_to_target()
+            if self.reached_target:
+                continue
             
             # Debug output
             floor_r, floor_g, floor_b = self.get_color_values()
@@ -740,4 +977,7 @@ class ErebusController:
 
 # Create and run controller
 controller = ErebusController()
-controller.run()
\ No newline at end of file
+try:
+    controller.run()
+finally:
+    controller.path_follower.close()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Audio Cache Constants
+AUDIO_CACHE_INDEX = "cache_index.json"
+AUDIO_CACHE_BUDGET = 64 * 1024 * 1024   # Bytes of audio kept before evicting
+
+
+class AudioCache:
+    """Persistent, content-addressed store for synthesized audio.
+
+    Files are named after a hash of (text, language, voice settings) so the
+    same sentence is only synthesized once across missions. An index file
+    keeps size, duration and last use of every entry; the least recently
+    used entries are evicted once the folder grows past max_bytes.
+    """
+
+    def __init__(self, folder, max_bytes=AUDIO_CACHE_BUDGET):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(folder, AUDIO_CACHE_INDEX)
+        self.entries = {}
+        self.total_bytes = 0
+        self.opened_at = time.time()
+        self._lock = threading.RLock()
+        os.makedirs(folder, exist_ok=True)
+
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r') as f:
+                    self.entries = json.load(f).get("entries", {})
+        except Exception as e:
+            print(f"[CACHE] Could not read {self.index_path}, starting empty: {e}")
+        self.total_bytes = sum(entry["bytes"] for entry in self.entries.values())
+
+    @staticmethod
+    def key(text, language, voice=None):
+        payload = json.dumps([text, language, voice or {}], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key, ext=None):
+        if ext is None:
+            ext = self.entries.get(key, {}).get("ext", ".mp3")
+        return os.path.join(self.folder, f"{key}{ext}")
+
+    def contains(self, key):
+        return key in self.entries
+
+    def lookup(self, key):
+        """Return (path, duration) for a cached entry and mark it as used"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self._drop(key)
+                return None
+            entry["last_used"] = time.time()
+            return path, entry["duration"]
+
+    def read(self, key):
+        """Return (audio bytes, duration) for a cached entry, or None"""
+        cached = self.lookup(key)
+        if cached is None:
+            return None
+        with open(cached[0], 'rb') as f:
+            return f.read(), cached[1]
+
+    def store(self, key, data, duration, ext=".mp3"):
+        """Write audio bytes once and register them, returns (path, duration)"""
+        path = self.path_for(key, ext)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries[key]["bytes"]
+            self.entries[key] = {"bytes": len(data), "duration": duration, "ext": ext, "last_used": time.time()}
+            self.total_bytes += len(data)
+            self._evict(keep=key)
+            self.save_index()
+        return path, duration
+
+    def get_or_render(self, key, render):
+        """Return (path, duration), calling render() -> (bytes, duration, ext) on a miss"""
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        rendered = render()
+        if rendered is None:
+            return None
+        return self.store(key, *rendered)
+
+    def save_index(self):
+        with self._lock:
+            data = json.dumps({"entries": self.entries})
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.index_path)
+
+    def cleanup(self):
+        """Remove files the index does not know about and enforce the byte budget"""
+        removed = 0
+        for filename in os.listdir(self.folder):
+            if filename in (AUDIO_CACHE_INDEX, AUDIO_CACHE_INDEX + ".tmp"):
+                continue
+            key = filename.split(".", 1)[0]
+            file_path = os.path.join(self.folder, filename)
+            # Files newer than the cache may still be rendering on another thread
+            if key in self.entries or os.path.getmtime(file_path) >= self.opened_at:
+                continue
+            try:
+                os.remove(file_path)
+                removed += 1
+            except Exception as e:
+                print(f"[CACHE] Failed to delete {filename}: {e}")
+        with self._lock:
+            for key in [key for key in self.entries if not os.path.exists(self.path_for(key))]:
+                self._drop(key)
+            self._evict()
+            self.save_index()
+        print(f"[CACHE] {len(self.entries)} entries, {self.total_bytes} bytes ({removed} stale files removed)")
+
+    def cleanup_async(self):
+        """Run cleanup() on a background thread"""
+        thread = threading.Thread(target=self.cleanup, name="audio-cache-cleanup", daemon=True)
+        thread.start()
+        return thread
+
+    def _evict(self, keep=None):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[CACHE] Failed to evict {key}: {e}")
+                continue
+            self._drop(key)
+
+    def _drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry["bytes"]
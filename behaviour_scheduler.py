@@ -0,0 +1,50 @@
+class BehaviourScheduler:
+    """Runs manoeuvres as generators, advanced one timestep per tick
+
+    A manoeuvre sets the wheel speeds and yields once per timestep. The
+    main loop steps the simulation, keeps sensing and reporting, and calls
+    tick(). Starting a more urgent manoeuvre (lower priority number)
+    closes the running one, so its finally: cleanup still runs.
+    """
+
+    def __init__(self):
+        self.task = None
+        self.name = None
+        self.priority = None
+        self.completed = 0
+        self.preempted = 0
+
+    @property
+    def busy(self):
+        return self.task is not None
+
+    def is_running(self, name):
+        return self.name == name
+
+    def start(self, name, task, priority):
+        """Run task unless an equally or more urgent manoeuvre is already running"""
+        if self.task is not None:
+            if priority >= self.priority:
+                task.close()
+                return False
+            print(f"[BEHAVIOUR] {name} pre-empts {self.name}")
+            self.preempted += 1
+            self.abort()
+        self.task, self.name, self.priority = task, name, priority
+        return True
+
+    def abort(self):
+        if self.task is not None:
+            self.task.close()
+        self.task = self.name = self.priority = None
+
+    def tick(self):
+        """Advance the running manoeuvre by one timestep, returns False if none is running"""
+        if self.task is None:
+            return False
+        try:
+            next(self.task)
+        except StopIteration:
+            self.completed += 1
+            self.task = self.name = self.priority = None
+        return True
@@ -0,0 +1,197 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from speech_backend import mp3_duration
+from victim_reporter import VictimReporter
+
+# Benchmark Constants
+BENCH_TIME_STEP = 32            # [ms], same as the controllers
+BENCH_DRAIN_TIMEOUT = 600.0     # Sim seconds to wait for queued speech after the last report
+FAKE_MP3_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC4]) + bytes(92)   # MPEG2 layer III, 24 kHz, 32 kbit/s
+FAKE_FRAMES_PER_WORD = 12       # ~0.29 s of audio per word
+
+
+class FakeGPS:
+    def __init__(self, robot):
+        self.robot = robot
+
+    def enable(self, timestep):
+        pass
+
+    def getValues(self):
+        return [self.robot.x, 0.0, self.robot.z]
+
+
+class FakeSpeaker:
+    def __init__(self, robot):
+        self.robot = robot
+        self.played = []
+
+    def playSound(self, left, right, sound, volume, pitch, balance, loop):
+        self.played.append((self.robot.getTime(), sound))
+
+    def stop(self, sound=None):
+        pass
+
+
+class FakeRobot:
+    """Stand-in for controller.Robot with just the calls the reporter uses"""
+
+    def __init__(self, timestep=BENCH_TIME_STEP):
+        self.timestep = timestep
+        self.time = 0.0
+        self.x = 0.0
+        self.z = 0.0
+        self.devices = {"gps": FakeGPS(self), "speaker": FakeSpeaker(self)}
+
+    def getBasicTimeStep(self):
+        return self.timestep
+
+    def getTime(self):
+        return self.time
+
+    def getDevice(self, name):
+        return self.devices[name]
+
+    def step(self, timestep):
+        self.time += timestep / 1000.0
+        return 0
+
+
+class FakeTTSBackend:
+    """Offline stand-in for GTTSBackend, returns silent mp3 frames"""
+
+    ext = ".mp3"
+
+    def __init__(self, language='en', latency=0.0):
+        self.language = language
+        self.latency = latency
+        self.calls = 0
+
+    def settings(self):
+        return {"engine": "fake"}
+
+    def synthesize(self, text, language=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)    # Network round-trip of the real service
+        data = FAKE_MP3_FRAME * (FAKE_FRAMES_PER_WORD * max(1, len(text.split())))
+        return data, mp3_duration(data), self.ext
+
+
+def load_scenario(path):
+    """Victims as dicts with x_cm, z_cm, type, hazard and optional robot_x, robot_z"""
+    with open(path, 'r', newline='') as f:
+        if path.endswith(".jsonl"):
+            victims = [json.loads(line) for line in f if line.strip()]
+        else:
+            victims = list(csv.DictReader(f))
+    for victim in victims:
+        victim["x_cm"] = float(victim["x_cm"])
+        victim["z_cm"] = float(victim["z_cm"])
+        victim["hazard"] = victim.get("hazard") or None
+        for key in ("robot_x", "robot_z"):
+            if victim.get(key) not in (None, ""):
+                victim[key] = float(victim[key])
+            else:
+                victim[key] = None
+    return victims
+
+
+def _summary(samples_ms):
+    if not samples_ms:
+        return {"count": 0}
+    ordered = sorted(samples_ms)
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def run_benchmark(scenario_path, phrases_path, workdir, rate=1.0, tts_latency=0.0, prebuild=True):
+    victims = load_scenario(scenario_path)
+    robot = FakeRobot()
+    backend = FakeTTSBackend(latency=tts_latency)
+    csv_path = os.path.join(workdir, "victim_report.csv")
+    reporter = VictimReporter(robot, phrases_path, os.path.join(workdir, "reports_audio"), csv_path,
+                              backend=backend)
+    if prebuild:
+        reporter.phrase_bank.build()
+
+    report_ms, stall_ms = [], []
+    interval = 1.0 / rate
+    index, steps = 0, 0
+    next_due = interval
+    last_report_time = 0.0
+    while True:
+        robot.step(BENCH_TIME_STEP)
+        steps += 1
+        step_start = time.perf_counter()
+        if index < len(victims) and robot.getTime() >= next_due:
+            victim = victims[index]
+            robot.x = victim["robot_x"] if victim["robot_x"] is not None else victim["x_cm"] / 100.0
+            robot.z = victim["robot_z"] if victim["robot_z"] is not None else victim["z_cm"] / 100.0
+            report_start = time.perf_counter()
+            reporter.report_victim(victim["x_cm"], victim["z_cm"], victim["type"], victim["hazard"], index + 1)
+            report_ms.append((time.perf_counter() - report_start) * 1000.0)
+            index += 1
+            next_due += interval
+            last_report_time = robot.getTime()
+        reporter.tick()
+        stall_ms.append((time.perf_counter() - step_start) * 1000.0)
+
+        if index >= len(victims):
+            if not reporter.speech.is_busy() or robot.getTime() - last_report_time > BENCH_DRAIN_TIMEOUT:
+                break
+        time.sleep(0)   # Let the speech worker run between steps
+
+    speaker_stats = reporter.speech.stats()
+    reporter.close()
+    log_path = reporter.victim_log.log_path
+    return {
+        "scenario": os.path.basename(scenario_path),
+        "victims": len(victims),
+        "rate": rate,
+        "tts_latency": tts_latency,
+        "sim_time": robot.getTime(),
+        "steps": steps,
+        "reports": reporter.reports,
+        "duplicates": reporter.duplicates,
+        "dedupe_hit_rate": reporter.dedupe_hit_rate(),
+        "report_latency_ms": _summary(report_ms),
+        "step_stall_ms": _summary(stall_ms),
+        "csv_bytes": os.path.getsize(csv_path),
+        "binary_log_bytes": os.path.getsize(log_path),
+        "tts_calls": backend.calls,
+        "sounds_played": len(robot.getDevice("speaker").played),
+        "speaker": speaker_stats,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a victim scenario through the reporting pipeline without Webots")
+    parser.add_argument("scenario", help="CSV or JSONL file with x_cm, z_cm, type, hazard[, robot_x, robot_z]")
+    parser.add_argument("--phrases", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "phrases.json"))
+    parser.add_argument("--rate", type=float, default=1.0, help="victims reported per simulated second")
+    parser.add_argument("--tts-latency", type=float, default=0.0, help="seconds the fake TTS backend sleeps per call")
+    parser.add_argument("--cold", action="store_true", help="do not pre-render the phrase bank")
+    parser.add_argument("--workdir", help="where CSV, logs and audio are written (default: a temp folder)")
+    parser.add_argument("--out", help="write the JSON results here instead of printing them")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_reporting_")
+    os.makedirs(workdir, exist_ok=True)
+    results = run_benchmark(args.scenario, args.phrases, workdir, args.rate, args.tts_latency, not args.cold)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
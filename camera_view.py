@@ -0,0 +1,53 @@
+import numpy as np
+
+# Camera View Constants, regions are (left, top, right, bottom) fractions of the frame
+FULL_FRAME = (0.0, 0.0, 1.0, 1.0)
+CENTRE_ROI = (0.25, 0.25, 0.75, 0.75)
+RED, GREEN, BLUE = 2, 1, 0      # Channel indices in Webots' BGRA layout
+
+
+class CameraView:
+    """NumPy view over a Webots camera image, no copy and no per-pixel Python calls
+
+    getImage() returns BGRA bytes; frombuffer wraps them as a read-only
+    (height, width, 4) array. Region statistics are vectorised over a
+    region of interest given as fractions of the frame, so detectors can
+    use every pixel in view rather than one.
+    """
+
+    def __init__(self, image, width, height):
+        self.width = width
+        self.height = height
+        self.pixels = np.frombuffer(image, dtype=np.uint8).reshape(height, width, 4)
+
+    def region(self, roi=FULL_FRAME):
+        """(h, w, 4) view of the region, at least one pixel"""
+        left, top, right, bottom = roi
+        x0, y0 = int(left * self.width), int(top * self.height)
+        x1 = max(x0 + 1, int(round(right * self.width)))
+        y1 = max(y0 + 1, int(round(bottom * self.height)))
+        return self.pixels[y0:y1, x0:x1]
+
+    def pixel(self, x, y):
+        b, g, r = (int(value) for value in self.pixels[y, x, :3])
+        return r, g, b
+
+    def mean(self, roi=FULL_FRAME):
+        """Mean (r, g, b) over the region"""
+        b, g, r = self.region(roi)[..., :3].reshape(-1, 3).mean(axis=0)
+        return float(r), float(g), float(b)
+
+    def histogram(self, roi=FULL_FRAME, channel=RED, bins=16):
+        """Pixel counts of one channel over the region, in equal-width bins over 0..255"""
+        counts, _ = np.histogram(self.region(roi)[..., channel], bins=bins, range=(0, 256))
+        return counts
+
+    def mask(self, roi=FULL_FRAME, lower=(0, 0, 0), upper=(255, 255, 255)):
+        """Boolean mask of region pixels with every channel inside [lower, upper], both given as (r, g, b)"""
+        region = self.region(roi)
+        bgr = region[..., :3]
+        return np.all((bgr >= lower[::-1]) & (bgr <= upper[::-1]), axis=-1)
+
+    def fraction(self, roi=FULL_FRAME, lower=(0, 0, 0), upper=(255, 255, 255)):
+        """Share of the region's pixels inside [lower, upper]"""
+        return float(self.mask(roi, lower, upper).mean())
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Colour LUT Constants
+LUT_BITS = 5                    # Levels per channel = 2 ** LUT_BITS (32 x 32 x 32 cells)
+LUT_SAMPLE_RADIUS = 2.0         # A calibration sample claims cells up to this many levels away
+LUT_PREFIX = "colour_lut_"      # Tables are saved as colour_lut_<hash>.npy next to the controller
+CLASS_NAMES = ('normal', 'hole', 'trap', 'swamp', 'checkpoint', 'wall', 'victim', 'hazmat')
+CLASS_IDS = {name: i for i, name in enumerate(CLASS_NAMES)}
+TABLES = ('floor', 'camera')    # Colour sensor pixels and camera pixels are classified separately
+
+
+def cell_centres(bits=LUT_BITS):
+    """(size, size, size, 3) RGB value at the centre of every cell"""
+    size, shift = 1 << bits, 8 - bits
+    levels = (np.arange(size) << shift) + (1 << shift) // 2
+    return np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1)
+
+
+def build_tables(rules, samples, bits=LUT_BITS, radius=LUT_SAMPLE_RADIUS):
+    """Class id per quantised colour for each table
+
+    rules: {table: [(class, (r, g, b) low, (r, g, b) high), ...]}, inclusive
+    boxes evaluated at the cell centres, later rules win. samples:
+    {table: {class: [(r, g, b), ...]}} calibration colours, each cell
+    within radius levels takes the class of its nearest sample, over the
+    rules.
+    """
+    size, shift = 1 << bits, 8 - bits
+    centres = cell_centres(bits)
+    tables = np.zeros((len(TABLES), size, size, size), dtype=np.uint8)
+    for t, table in enumerate(TABLES):
+        for name, low, high in rules.get(table, []):
+            inside = np.all((centres >= low) & (centres <= high), axis=-1)
+            tables[t][inside] = CLASS_IDS[name]
+        points, ids = [], []
+        for name, colours in samples.get(table, {}).items():
+            for colour in colours:
+                points.append([(value >> shift) + 0.5 for value in colour])
+                ids.append(CLASS_IDS[name])
+        if points:
+            cells = (np.indices((size, size, size)).reshape(3, -1).T + 0.5)
+            distances = np.linalg.norm(cells[:, None, :] - np.asarray(points)[None, :, :], axis=-1)
+            nearest = distances.argmin(axis=1)
+            claimed = distances[np.arange(len(cells)), nearest] <= radius
+            flat = tables[t].reshape(-1)
+            flat[claimed] = np.asarray(ids, dtype=np.uint8)[nearest[claimed]]
+    return tables
+
+
+class ColourLUT:
+    """Quantised RGB -> class id lookup, one table for the floor and one for the camera
+
+    Classifying a pixel is one table read, segmenting a camera region is a
+    single NumPy fancy index. Tables are built from threshold rules plus
+    calibration samples and cached on disk under a hash of their inputs,
+    later missions memory-map the cached file.
+    """
+
+    def __init__(self, tables, bits=LUT_BITS):
+        self.tables = tables
+        self.bits = bits
+        self.shift = 8 - bits
+
+    @classmethod
+    def load(cls, folder, rules, samples, bits=LUT_BITS):
+        payload = json.dumps([bits, LUT_SAMPLE_RADIUS, CLASS_NAMES, rules, samples], sort_keys=True)
+        path = os.path.join(folder, f"{LUT_PREFIX}{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}.npy")
+        if os.path.exists(path):
+            try:
+                return cls(np.load(path, mmap_mode='r'), bits)
+            except Exception as e:
+                print(f"[LUT] Could not map {path}, rebuilding: {e}")
+        tables = build_tables(rules, samples, bits)
+        try:
+            np.save(path, tables)
+            print(f"[LUT] Built {path}")
+            # Tables built from older rules or samples are never mapped again
+            for name in os.listdir(folder):
+                stale = os.path.join(folder, name)
+                if name.startswith(LUT_PREFIX) and name.endswith(".npy") and stale != path:
+                    os.remove(stale)
+            return cls(np.load(path, mmap_mode='r'), bits)
+        except Exception as e:
+            print(f"[LUT] Could not save {path}, using the table in memory: {e}")
+            return cls(tables, bits)
+
+    def classify(self, rgb, table='floor'):
+        """Class id of one (r, g, b) colour"""
+        s = self.shift
+        return int(self.tables[TABLES.index(table), rgb[0] >> s, rgb[1] >> s, rgb[2] >> s])
+
+    def name(self, rgb, table='floor'):
+        return CLASS_NAMES[self.classify(rgb, table)]
+
+    def segment(self, pixels, table='camera'):
+        """Class id per pixel of a BGRA (or BGR) array such as a CameraView region"""
+        s = self.shift
+        return self.tables[TABLES.index(table)][pixels[..., 2] >> s, pixels[..., 1] >> s, pixels[..., 0] >> s]
+
+    def fraction(self, pixels, name, table='camera'):
+        """Share of the pixels classified as name"""
+        return float((self.segment(pixels, table) == CLASS_IDS[name]).mean())
+
@@ -0,0 +1,111 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from motion_model import body_velocity, WHEEL_RADIUS
+
+# Motion Health Constants
+HEALTH_WINDOW = 32              # Control steps kept in the ring buffers (~1 s)
+HEALTH_MIN_EXPECTED = 0.02      # Commanded / wheel travel over the window before stuck / slip are judged [m]
+STUCK_DISTANCE = 0.01           # GPS travel over the window below which the robot is stuck [m]
+SLIP_RATIO = 0.5                # GPS travel below this fraction of the expected travel is slip
+OSCILLATION_FLIPS = 6           # Turn direction changes within the window that count as flapping
+OSCILLATION_NET_RATIO = 0.3     # ...when net displacement is below this fraction of the path travelled
+TURN_DEADBAND = 0.5             # Wheel speed difference [rad/s] below which the robot is driving straight
+
+MotionHealth = namedtuple("MotionHealth", "stuck slip oscillating travelled expected commanded flips")
+
+
+class MotionHealthMonitor:
+    """Stuck, slip and oscillation detection over the last HEALTH_WINDOW steps
+
+    Pose, commanded wheel speeds and encoder deltas go into fixed numpy
+    ring buffers. The window totals are kept as running sums, so record()
+    and status() cost the same however long the mission runs. Stuck is
+    judged against the commanded travel, since jammed wheels do not turn
+    their encoders either. Slip compares GPS travel with the encoder
+    travel, or with the commanded travel when there are no encoders.
+    """
+
+    def __init__(self, size=HEALTH_WINDOW):
+        self.size = size
+        self.poses = np.zeros((size, 2))
+        self.commands = np.zeros((size, 2))
+        self.encoder_deltas = np.zeros((size, 2))
+        self.travelled = np.zeros(size)     # GPS distance per step [m]
+        self.expected = np.zeros(size)      # Distance the wheels covered per step, by encoder or command [m]
+        self.commanded = np.zeros(size)     # Distance the wheel speed commands ask for per step [m]
+        self.flips = np.zeros(size, dtype=np.int8)
+        self.count = 0
+        self._index = 0
+        self._sum_travelled = 0.0
+        self._sum_expected = 0.0
+        self._sum_commanded = 0.0
+        self._sum_flips = 0
+        self._last = None           # (x, z, time, turn sign, encoder positions)
+
+    def reset(self):
+        """Forget the window, e.g. after a recovery manoeuvre or a new target"""
+        self.__init__(self.size)
+
+    def record(self, x, z, left, right, time, encoders=None):
+        """Add one control step: GPS pose, commanded wheel speeds and optional encoder positions [rad]"""
+        if self._last is None:
+            self._last = (x, z, time, 0, encoders)
+            return
+        last_x, last_z, last_time, last_turn, last_encoders = self._last
+        dt = max(time - last_time, 0.0)
+        travelled = math.hypot(x - last_x, z - last_z)
+        commanded = abs(body_velocity(left, right)[0]) * dt
+        if encoders is not None and last_encoders is not None:
+            delta = (encoders[0] - last_encoders[0], encoders[1] - last_encoders[1])
+            expected = abs(WHEEL_RADIUS * (delta[0] + delta[1]) / 2.0)
+        else:
+            delta = (0.0, 0.0)
+            expected = commanded
+        turn = 0 if abs(left - right) < TURN_DEADBAND else (1 if left > right else -1)
+        flip = int(turn != 0 and last_turn != 0 and turn != last_turn)
+        self._last = (x, z, time, turn or last_turn, encoders)
+
+        i = self._index
+        if self.count == self.size:
+            self._sum_travelled -= float(self.travelled[i])
+            self._sum_expected -= float(self.expected[i])
+            self._sum_commanded -= float(self.commanded[i])
+            self._sum_flips -= int(self.flips[i])
+        self.poses[i] = (x, z)
+        self.commands[i] = (left, right)
+        self.encoder_deltas[i] = delta
+        self.travelled[i] = travelled
+        self.expected[i] = expected
+        self.commanded[i] = commanded
+        self.flips[i] = flip
+        self._sum_travelled += travelled
+        self._sum_expected += expected
+        self._sum_commanded += commanded
+        self._sum_flips += flip
+        self.count = min(self.count + 1, self.size)
+        self._index = (i + 1) % self.size
+        if self._index == 0:
+            # Stop float drift from the running subtraction, once per wrap keeps this O(1) amortised
+            self._sum_travelled = float(self.travelled.sum())
+            self._sum_expected = float(self.expected.sum())
+            self._sum_commanded = float(self.commanded.sum())
+
+    def net_displacement(self):
+        if self.count < 2:
+            return 0.0
+        oldest = self.poses[self._index] if self.count == self.size else self.poses[0]
+        newest = self.poses[self._index - 1]
+        return float(math.hypot(newest[0] - oldest[0], newest[1] - oldest[1]))
+
+    def status(self):
+        full = self.count == self.size
+        stuck = full and self._sum_commanded >= HEALTH_MIN_EXPECTED and self._sum_travelled < STUCK_DISTANCE
+        slip = full and not stuck and self._sum_expected >= HEALTH_MIN_EXPECTED and \
+            self._sum_travelled < SLIP_RATIO * self._sum_expected
+        oscillating = full and self._sum_flips >= OSCILLATION_FLIPS and \
+            self.net_displacement() < OSCILLATION_NET_RATIO * max(self._sum_travelled, 1e-9)
+        return MotionHealth(stuck, slip, oscillating, self._sum_travelled, self._sum_expected,
+                            self._sum_commanded, self._sum_flips)
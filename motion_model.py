@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+
+# Robot Geometry (same values as Project.V1.py)
+WHEEL_RADIUS = 0.0205           # [m]
+AXLE_LENGTH = 0.0565            # Distance between the wheels [m]
+MAX_WHEEL_SPEED = 6.28          # [rad/s]
+
+# Dynamic Window Constants
+DWA_MAX_WHEEL_ACCEL = 60.0      # [rad/s^2], bounds the speeds reachable in one control step
+DWA_SAMPLES = 9                 # Velocities sampled per wheel inside the window
+DWA_HORIZON = 0.4               # Seconds each candidate is rolled forward
+DWA_HEADING_WEIGHT = 0.02       # Cost per radian of heading error at the end of the horizon [m/rad]
+DWA_REVERSE_PENALTY = 0.05      # Cost per m/s of reverse speed
+HEADING_MIN_DISPLACEMENT = 0.004  # GPS movement needed before heading is re-measured [m]
+
+# Pure Pursuit Constants
+PURSUIT_LOOKAHEAD = 0.06        # [m], about half a tile
+PURSUIT_SPEED = 5.0             # Wheel speed on straight segments [rad/s]
+
+
+def wrap_angle(angle):
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def body_velocity(left, right):
+    """Linear [m/s] and angular [rad/s] velocity for wheel speeds in rad/s
+
+    Heading is measured in the x-z ground plane (GPS y is up), so turning
+    left (right wheel faster) lowers the heading angle.
+    """
+    linear = WHEEL_RADIUS * (left + right) / 2.0
+    angular = WHEEL_RADIUS * (left - right) / AXLE_LENGTH
+    return linear, angular
+
+
+def predict_pose(x, z, heading, left, right, dt):
+    """Pose after driving at constant wheel speeds for dt seconds (exact arc)
+
+    Works on scalars or numpy arrays of wheel speeds.
+    """
+    linear, angular = body_velocity(left, right)
+    new_heading = heading + angular * dt
+    straight = np.abs(angular) < 1e-6
+    safe_angular = np.where(straight, 1.0, angular)
+    new_x = np.where(straight, x + linear * dt * np.cos(heading),
+                     x + linear / safe_angular * (np.sin(new_heading) - np.sin(heading)))
+    new_z = np.where(straight, z + linear * dt * np.sin(heading),
+                     z - linear / safe_angular * (np.cos(new_heading) - np.cos(heading)))
+    return new_x, new_z, new_heading
+
+
+class HeadingEstimator:
+    """Robot heading from GPS displacement and the commanded wheel speeds
+
+    The robot has no compass. Between fixes the heading is dead-reckoned
+    from the last wheel command; once the robot has moved far enough the
+    chord of the travelled arc gives an absolute measurement.
+    """
+
+    def __init__(self):
+        self.heading = None
+        self.left = 0.0
+        self.right = 0.0
+        self._last = None         # (x, z, time) of the last update
+        self._anchor = None       # (x, z) where the current chord starts
+        self._turned = 0.0        # Heading change since the anchor
+
+    def set_command(self, left, right):
+        self.left = left
+        self.right = right
+
+    def update(self, x, z, time):
+        if self._last is None:
+            self._last = (x, z, time)
+            self._anchor = (x, z)
+            return self.heading
+        dt = time - self._last[2]
+        self._last = (x, z, time)
+        if dt <= 0:
+            return self.heading
+        linear, angular = body_velocity(self.left, self.right)
+        turn = angular * dt
+        self._turned += turn
+        if self.heading is not None:
+            self.heading = wrap_angle(self.heading + turn)
+
+        dx, dz = x - self._anchor[0], z - self._anchor[1]
+        if math.hypot(dx, dz) >= HEADING_MIN_DISPLACEMENT and abs(linear) > 1e-4:
+            # The chord of an arc points along the heading halfway through the turn
+            chord = math.atan2(dz, dx) + (math.pi if linear < 0 else 0.0)
+            self.heading = wrap_angle(chord + self._turned / 2.0)
+            self._anchor = (x, z)
+            self._turned = 0.0
+        return self.heading
+
+
+class DynamicWindowPlanner:
+    """Picks wheel speeds by rolling sampled (left, right) pairs through the kinematic model
+
+    Only speeds reachable from the last command within one control step
+    are considered, so the chosen command is always one the motors can
+    follow. No probe moves are made.
+    """
+
+    def __init__(self, max_speed=MAX_WHEEL_SPEED, max_accel=DWA_MAX_WHEEL_ACCEL, samples=DWA_SAMPLES,
+                 horizon=DWA_HORIZON):
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.samples = samples
+        self.horizon = horizon
+        self.left = 0.0
+        self.right = 0.0
+
+    def set_command(self, left, right):
+        """Last wheel speeds sent to the motors, the centre of the next window"""
+        self.left = left
+        self.right = right
+
+    def window(self, dt):
+        reach = self.max_accel * dt
+        left = np.linspace(max(-self.max_speed, self.left - reach), min(self.max_speed, self.left + reach), self.samples)
+        right = np.linspace(max(-self.max_speed, self.right - reach), min(self.max_speed, self.right + reach), self.samples)
+        return np.meshgrid(left, right, indexing='ij')
+
+    def plan(self, x, z, heading, target, dt):
+        """Return (left, right, predicted distance to target) for the next control step"""
+        left, right = self.window(dt)
+        if heading is None:
+            # No heading fix yet: drive as straight and fast as the window allows
+            index = np.unravel_index(np.argmax(left + right - np.abs(left - right)), left.shape)
+        else:
+            end_x, end_z, end_heading = predict_pose(x, z, heading, left, right, self.horizon)
+            distance = np.hypot(target[0] - end_x, target[1] - end_z)
+            bearing = np.arctan2(target[1] - end_z, target[0] - end_x)
+            heading_error = np.abs((bearing - end_heading + np.pi) % (2 * np.pi) - np.pi)
+            linear, _ = body_velocity(left, right)
+            cost = distance + DWA_HEADING_WEIGHT * heading_error + DWA_REVERSE_PENALTY * np.maximum(-linear, 0.0)
+            index = np.unravel_index(np.argmin(cost), cost.shape)
+        self.set_command(float(left[index]), float(right[index]))
+        if heading is None:
+            return self.left, self.right, math.hypot(target[0] - x, target[1] - z)
+        return self.left, self.right, float(distance[index])
+
+
+class PurePursuit:
+    """Tracks a waypoint list by steering along the arc through a look-ahead point"""
+
+    def __init__(self, lookahead=PURSUIT_LOOKAHEAD, speed=PURSUIT_SPEED, max_speed=MAX_WHEEL_SPEED):
+        self.lookahead = lookahead
+        self.speed = speed
+        self.max_speed = max_speed
+        self.waypoints = []
+        self.index = 0
+
+    def set_path(self, waypoints):
+        self.waypoints = list(waypoints)
+        self.index = 0
+
+    def lookahead_point(self, x, z):
+        """First waypoint at least one look-ahead distance away, never going back along the path"""
+        while self.index < len(self.waypoints) - 1 and \
+                math.hypot(self.waypoints[self.index][0] - x, self.waypoints[self.index][1] - z) < self.lookahead:
+            self.index += 1
+        return self.waypoints[self.index]
+
+    def command(self, x, z, heading):
+        """Wheel speeds [rad/s] that follow the path from this pose"""
+        goal_x, goal_z = self.lookahead_point(x, z)
+        distance = math.hypot(goal_x - x, goal_z - z)
+        alpha = wrap_angle(math.atan2(goal_z - z, goal_x - x) - heading)
+        linear = self.speed * WHEEL_RADIUS
+        if abs(alpha) > math.pi / 2:
+            linear = 0.0    # Point behind the robot: turn on the spot first
+        curvature = 2.0 * math.sin(alpha) / max(distance, 1e-3)
+        angular = linear * curvature if linear else math.copysign(self.speed * WHEEL_RADIUS / AXLE_LENGTH, alpha)
+        left = (linear + angular * AXLE_LENGTH / 2.0) / WHEEL_RADIUS
+        right = (linear - angular * AXLE_LENGTH / 2.0) / WHEEL_RADIUS
+        scale = max(1.0, abs(left) / self.max_speed, abs(right) / self.max_speed)
+        return left / scale, right / scale
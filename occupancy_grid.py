@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+
+# Occupancy Grid Constants
+GRID_CELL_SIZE = 0.02           # [m]
+GRID_HALF_EXTENT = 1.5          # Grid covers -1.5..1.5 m on x and z
+ROBOT_RADIUS = 0.037            # [m], obstacles are inflated by this for planning
+SENSOR_MAX_RANGE = 0.3          # Readings beyond this are treated as "no wall seen" [m]
+SENSOR_BEAM_HALF_WIDTH = 0.03   # A hit marks the wall this far either side of the ray [m]
+SENSOR_HIT_WEIGHT = 3           # Log-odds added to a cell where a ray ends on a wall
+SENSOR_MISS_WEIGHT = 1          # Log-odds removed from cells a ray passes through
+OCCUPIED_LOG_ODDS = 4           # Cells at or above this are walls
+LOG_ODDS_LIMIT = 20
+
+# ps0..ps7 mounting angles, left of the heading is positive [rad]
+SENSOR_ANGLES = (-0.30, -0.80, -1.57, -2.64, 2.64, 1.57, 0.80, 0.30)
+
+
+class OccupancyGrid:
+    """Log-odds occupancy grid built from the distance sensors and GPS
+
+    Readings are ranges in metres, as in Project.V1.py. Unknown cells are
+    free for planning, so the robot heads straight for a target until a
+    wall is actually sensed. Every cell whose blocked state changes is
+    queued in changed_cells so an incremental planner can repair only
+    those.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE, half_extent=GRID_HALF_EXTENT, robot_radius=ROBOT_RADIUS):
+        self.cell_size = cell_size
+        self.half_extent = half_extent
+        self.size = int(round(2 * half_extent / cell_size))
+        self.log_odds = np.zeros((self.size, self.size), dtype=np.int16)
+        # Number of occupied cells within the robot radius, > 0 means blocked for the robot centre
+        self.inflation = np.zeros((self.size, self.size), dtype=np.int16)
+        radius = int(math.ceil(robot_radius / cell_size))
+        self._footprint = [(di, dj) for di in range(-radius, radius + 1) for dj in range(-radius, radius + 1)
+                           if di * di + dj * dj <= radius * radius]
+        self.blocked_cells = set()     # Same as inflation > 0, a set is far cheaper to probe from Python
+        self.changed_cells = set()
+        self.revision = 0               # Bumped whenever a cell's blocked state changes
+
+    def cell_of(self, x, z):
+        i = int((x + self.half_extent) / self.cell_size)
+        j = int((z + self.half_extent) / self.cell_size)
+        return min(max(i, 0), self.size - 1), min(max(j, 0), self.size - 1)
+
+    def center_of(self, cell):
+        return ((cell[0] + 0.5) * self.cell_size - self.half_extent,
+                (cell[1] + 0.5) * self.cell_size - self.half_extent)
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.size and 0 <= cell[1] < self.size
+
+    def is_occupied(self, cell):
+        return self.log_odds[cell] >= OCCUPIED_LOG_ODDS
+
+    def is_blocked(self, cell):
+        return cell in self.blocked_cells
+
+    def _set_occupied(self, cell, occupied):
+        step = 1 if occupied else -1
+        for di, dj in self._footprint:
+            neighbour = (cell[0] + di, cell[1] + dj)
+            if self.in_bounds(neighbour):
+                self.inflation[neighbour] += step
+                blocked = self.inflation[neighbour] > 0
+                if blocked != (neighbour in self.blocked_cells):
+                    if blocked:
+                        self.blocked_cells.add(neighbour)
+                    else:
+                        self.blocked_cells.discard(neighbour)
+                    self.changed_cells.add(neighbour)
+                    self.revision += 1
+
+    def _add(self, cell, delta):
+        was_occupied = self.is_occupied(cell)
+        self.log_odds[cell] = max(-LOG_ODDS_LIMIT, min(LOG_ODDS_LIMIT, int(self.log_odds[cell]) + delta))
+        if was_occupied != self.is_occupied(cell):
+            self._set_occupied(cell, not was_occupied)
+
+    def integrate_ranges(self, x, z, heading, ranges):
+        """Ray-cast one set of ps0..ps7 readings from the robot pose"""
+        for angle, distance in zip(SENSOR_ANGLES, ranges):
+            # Left of the heading is a lower heading angle in the x-z plane (see motion_model)
+            direction = heading - angle
+            hit = distance < SENSOR_MAX_RANGE
+            length = ROBOT_RADIUS + min(distance, SENSOR_MAX_RANGE)
+            dx, dz = math.cos(direction), math.sin(direction)
+            end_x, end_z = x + dx * length, z + dz * length
+            # A single ray only samples the wall it hits, so mark a short segment across the beam
+            wall_cells = set()
+            if hit:
+                spread = int(SENSOR_BEAM_HALF_WIDTH / (self.cell_size / 2))
+                for k in range(-spread, spread + 1):
+                    offset = k * self.cell_size / 2
+                    wall_cells.add(self.cell_of(end_x - dz * offset, end_z + dx * offset))
+            # Free space stops a cell short of the hit so nearby wall cells are not erased
+            free_length = length - self.cell_size if hit else length
+            seen = set(wall_cells)
+            for k in range(int(free_length / (self.cell_size / 2))):
+                cell = self.cell_of(x + dx * k * self.cell_size / 2, z + dz * k * self.cell_size / 2)
+                if cell not in seen:
+                    seen.add(cell)
+                    self._add(cell, -SENSOR_MISS_WEIGHT)
+            for cell in wall_cells:
+                self._add(cell, SENSOR_HIT_WEIGHT)
+
+    def take_changes(self):
+        """Cells whose blocked state changed since the last call"""
+        changed, self.changed_cells = self.changed_cells, set()
+        return changed
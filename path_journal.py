@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import struct
+
+# Path Journal Constants
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAGIC = b"PJNL"
+JOURNAL_VERSION = 2
+JOURNAL_HEADER = struct.Struct("<4sHHI")        # magic, version, record size, snapshot epoch
+JOURNAL_RECORDS = {
+    1: struct.Struct("<cI"),                    # action type, steps
+    2: struct.Struct("<cIff"),                  # action type, steps, GPS x and z where the action ended (NaN if unknown)
+}
+JOURNAL_RECORD = JOURNAL_RECORDS[JOURNAL_VERSION]
+MAX_RUN_STEPS = 2 ** 32 - 1                     # Longest run one record can hold
+
+
+def merge_action(actions, action_type, steps, x=None, z=None):
+    """Add an action to a path, extending the last entry if it is the same type
+
+    x, z is the GPS position where the action ended, it becomes the
+    waypoint of the (possibly extended) entry.
+    """
+    if actions and actions[-1]['type'] == action_type:
+        actions[-1]['steps'] += steps
+        action = actions[-1]
+    else:
+        action = {'type': action_type, 'steps': steps}
+        actions.append(action)
+    if x is not None and z is not None:
+        action['x'], action['z'] = round(x, 4), round(z, 4)
+    else:
+        action.pop('x', None)
+        action.pop('z', None)
+
+
+def read_journal(journal_path):
+    """Return (epoch, version, [(type, steps, x, z), ...]), a torn last record is ignored"""
+    with open(journal_path, 'rb') as f:
+        data = f.read()
+    if len(data) < JOURNAL_HEADER.size:
+        return None, None, []
+    magic, version, record_size, epoch = JOURNAL_HEADER.unpack_from(data)
+    record = JOURNAL_RECORDS.get(version)
+    if magic != JOURNAL_MAGIC or record is None or record_size != record.size:
+        raise ValueError(f"{journal_path} is not a path journal this controller can read")
+    body = data[JOURNAL_HEADER.size:]
+    usable = len(body) - len(body) % record.size
+    records = []
+    for fields in record.iter_unpack(body[:usable]):
+        x, z = fields[2:] if len(fields) == 4 else (math.nan, math.nan)
+        records.append((fields[0].decode('ascii'), fields[1],
+                        None if math.isnan(x) else x, None if math.isnan(z) else z))
+    return epoch, version, records
+
+
+class PathJournal:
+    """Recorded path kept as a JSON snapshot plus an append-only binary journal.
+
+    add() writes one fixed-size record, or rewrites the step count and end
+    waypoint of the last record in place when the action repeats, so recording never
+    rewrites the whole path. compact() folds the journal into the
+    snapshot (robot_path.json, readable by older controllers) and starts
+    an empty journal. Each snapshot carries an epoch so a journal that was
+    already folded in is not replayed twice after a crash.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None, load=True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + JOURNAL_SUFFIX
+        self.epoch = 0
+        self.actions = []
+        self.start = None           # GPS (x, z) a learned route starts from, None for recorded paths
+        self._file = None
+        self._last_type = None      # Type of the last journal record, None if it may not be extended
+        self._last_steps = 0
+        if load:
+            self.load()
+
+    def load(self):
+        """Read the legacy/snapshot JSON and replay the journal on top of it"""
+        self.actions = []
+        self.start = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+            self.epoch = snapshot.get('epoch', 0)
+            self.start = tuple(snapshot['start']) if snapshot.get('start') else None
+            for action in snapshot.get('path', []):
+                if 'x' in action and 'z' in action:
+                    self.actions.append(dict(action))   # Each waypoint is its own entry
+                else:
+                    # Legacy files store repeats as separate entries, they are merged into runs here
+                    merge_action(self.actions, action['type'], action['steps'])
+        if os.path.exists(self.journal_path):
+            epoch, _, records = read_journal(self.journal_path)
+            if epoch == self.epoch:
+                for action_type, steps, x, z in records:
+                    merge_action(self.actions, action_type, steps, x, z)
+        return self.actions
+
+    def _open(self):
+        epoch = version = None
+        if os.path.exists(self.journal_path):
+            epoch, version, _ = read_journal(self.journal_path)
+        if epoch == self.epoch and version != JOURNAL_VERSION:
+            # Journal in an older record format: fold it into the snapshot (the epoch moves on)
+            self.compact()
+        if epoch != self.epoch or version != JOURNAL_VERSION:
+            # Missing, empty or from an older snapshot: start a fresh journal
+            with open(self.journal_path, 'wb') as f:
+                f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, JOURNAL_RECORD.size, self.epoch))
+        self._file = open(self.journal_path, 'r+b')
+        size = self._file.seek(0, os.SEEK_END)
+        # Drop a torn record left by a crash so new records stay aligned
+        self._file.truncate(size - (size - JOURNAL_HEADER.size) % JOURNAL_RECORD.size)
+        self._file.seek(0, os.SEEK_END)
+        self._last_type = None
+
+    def add(self, action_type, steps, x=None, z=None):
+        """Record an action that ended at GPS position x, z (if known)"""
+        if len(action_type) != 1:
+            raise ValueError(f"path action type must be a single character, got {action_type!r}")
+        if self._file is None:
+            self._open()
+        merge_action(self.actions, action_type, steps, x, z)
+        if action_type == self._last_type and self._last_steps + steps <= MAX_RUN_STEPS:
+            self._last_steps += steps
+            self._file.seek(-JOURNAL_RECORD.size, os.SEEK_END)
+        else:
+            self._last_type, self._last_steps = action_type, steps
+        self._file.write(JOURNAL_RECORD.pack(action_type.encode('ascii'), self._last_steps,
+                                             math.nan if x is None else x, math.nan if z is None else z))
+        self._file.flush()
+
+    def compact(self):
+        """Write the whole path as a new JSON snapshot and empty the journal"""
+        self.epoch += 1
+        temp_path = self.snapshot_path + ".tmp"
+        snapshot = {'epoch': self.epoch, 'path': self.actions}
+        if self.start is not None:
+            snapshot['start'] = list(self.start)
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(temp_path, self.snapshot_path)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def replace(self, actions, start=None):
+        """Make actions (e.g. a learned waypoint route) the whole path and write the snapshot"""
+        self.actions = [dict(action) for action in actions]
+        self.start = tuple(start) if start is not None else None
+        self.compact()
+
+    def close(self):
+        if self._file is not None:
+            self.compact()
@@ -0,0 +1,208 @@
+import heapq
+import math
+
+SQRT2 = math.sqrt(2)
+KEY_TOLERANCE = 1e-9            # Float slack when comparing D* Lite keys
+NEIGHBOURS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+              (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+
+def octile(a, b):
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def neighbours(grid, cell):
+    """Free 8-connected neighbours with their step cost, diagonals may not cut wall corners"""
+    i, j = cell
+    for di, dj, cost in NEIGHBOURS:
+        neighbour = (i + di, j + dj)
+        if not grid.in_bounds(neighbour) or grid.is_blocked(neighbour):
+            continue
+        if di and dj and (grid.is_blocked((i + di, j)) or grid.is_blocked((i, j + dj))):
+            continue
+        yield neighbour, cost
+
+
+def astar(grid, start, goal):
+    """Shortest 8-connected cell path from start to goal, or None if the goal is walled off"""
+    open_heap = [(octile(start, goal), 0.0, start)]
+    came_from = {start: None}
+    cost_so_far = {start: 0.0}
+    while open_heap:
+        _, cost, cell = heapq.heappop(open_heap)
+        if cell == goal:
+            path = []
+            while cell is not None:
+                path.append(cell)
+                cell = came_from[cell]
+            return path[::-1]
+        if cost > cost_so_far[cell]:
+            continue    # Stale heap entry
+        for neighbour, step in neighbours(grid, cell):
+            new_cost = cost + step
+            if new_cost < cost_so_far.get(neighbour, float('inf')):
+                cost_so_far[neighbour] = new_cost
+                came_from[neighbour] = cell
+                heapq.heappush(open_heap, (new_cost + octile(neighbour, goal), new_cost, neighbour))
+    return None
+
+
+def path_to_waypoints(grid, cells):
+    """World waypoints at the corners of a cell path (straight runs collapse to their ends)"""
+    if not cells:
+        return []
+    corners = [cells[0]]
+    for prev, cell, nxt in zip(cells, cells[1:], cells[2:]):
+        if (cell[0] - prev[0], cell[1] - prev[1]) != (nxt[0] - cell[0], nxt[1] - cell[1]):
+            corners.append(cell)
+    if len(cells) > 1:
+        corners.append(cells[-1])
+    return [grid.center_of(cell) for cell in corners]
+
+
+class DStarLite:
+    """Incremental shortest path from the robot to a fixed goal (D* Lite, Koenig & Likhachev)
+
+    The search runs backwards from the goal, so when the distance sensors
+    block or free cells only the part of the search tree behind those
+    cells is repaired. compute() takes a work budget and can be resumed
+    on the next control step; until it finishes the robot keeps following
+    the previous route.
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.km = 0.0
+        self.dirty = True           # Route may have changed since the last path()
+        self.expansions = 0
+        self._last_start = start
+        self._g = {}
+        self._rhs = {goal: 0.0}
+        self._open = {}             # cell -> key currently in the heap, stale heap entries are skipped
+        self._heap = []
+        self._pending = set()       # Changed cells not yet applied
+        self._push(goal)
+
+    def g(self, cell):
+        return self._g.get(cell, math.inf)
+
+    def rhs(self, cell):
+        return self._rhs.get(cell, math.inf)
+
+    def key(self, cell):
+        best = min(self.g(cell), self.rhs(cell))
+        return best + octile(self.start, cell) + self.km, best
+
+    def _push(self, cell):
+        key = self.key(cell)
+        self._open[cell] = key
+        heapq.heappush(self._heap, (key, cell))
+
+    def _passable(self, cell):
+        # The robot's own cell may sit inside a wall's inflation, it can still drive out of it
+        return cell == self.start or cell not in self.grid.blocked_cells
+
+    def cost(self, a, b):
+        if not (self._passable(a) and self._passable(b)):
+            return math.inf
+        if a[0] != b[0] and a[1] != b[1]:
+            if not (self._passable((b[0], a[1])) and self._passable((a[0], b[1]))):
+                return math.inf     # Diagonal would cut a wall corner
+            return SQRT2
+        return 1.0
+
+    def _around(self, cell):
+        i, j = cell
+        for di, dj, _ in NEIGHBOURS:
+            neighbour = (i + di, j + dj)
+            if self.grid.in_bounds(neighbour):
+                yield neighbour
+
+    def _update_vertex(self, cell):
+        if cell != self.goal:
+            self._rhs[cell] = min((self.cost(cell, nxt) + self.g(nxt) for nxt in self._around(cell)), default=math.inf)
+        self._open.pop(cell, None)
+        if self.g(cell) != self.rhs(cell):
+            self._push(cell)
+
+    def update_start(self, start):
+        """The robot moved to another cell"""
+        if start == self.start:
+            return
+        previous, self.start = self.start, start
+        self.km += octile(self._last_start, start)
+        self._last_start = start
+        # Leaving or entering an inflated cell changes which edges the robot may use
+        for cell in (previous, start):
+            if self.grid.is_blocked(cell):
+                self._pending.add(cell)
+
+    def update_cells(self, cells):
+        """Queue cells whose blocked state changed, applied within compute()'s budget"""
+        self._pending.update(cells)
+
+    def _apply(self, cell):
+        self._update_vertex(cell)
+        for neighbour in self._around(cell):
+            self._update_vertex(neighbour)
+
+    def compute(self, budget):
+        """Apply queued cell changes and expand states, at most budget of them in total
+
+        Returns True once the route from the current start is up to date.
+        """
+        work = 0
+        while self._pending and work < budget:
+            self._apply(self._pending.pop())
+            self.dirty = True
+            work += 1
+        if self._pending:
+            return False
+        while self._heap:
+            key, cell = self._heap[0]
+            if self._open.get(cell) != key:
+                heapq.heappop(self._heap)
+                continue
+            # Ties with the start key are the cells on the route itself, expand them too so
+            # path() can follow the whole route and not just its first step
+            if key[0] > self.key(self.start)[0] + KEY_TOLERANCE and self.rhs(self.start) == self.g(self.start):
+                return True
+            if work >= budget:
+                return False
+            work += 1
+            self.expansions += 1
+            self.dirty = True
+            new_key = self.key(cell)
+            heapq.heappop(self._heap)
+            if key < new_key:
+                self._push(cell)
+                continue
+            del self._open[cell]
+            if self.g(cell) > self.rhs(cell):
+                self._g[cell] = self.rhs(cell)
+                for neighbour in self._around(cell):
+                    self._update_vertex(neighbour)
+            else:
+                self._g[cell] = math.inf
+                self._update_vertex(cell)
+                for neighbour in self._around(cell):
+                    self._update_vertex(neighbour)
+        return True
+
+    def path(self, max_length=None):
+        """Cells from the robot to the goal following the current g values, None if unreachable"""
+        self.dirty = False
+        if self.g(self.start) == math.inf:
+            return None
+        max_length = max_length or self.grid.size * self.grid.size
+        cells = [self.start]
+        cell = self.start
+        while cell != self.goal and len(cells) < max_length:
+            cell = min(self._around(cell), key=lambda nxt: self.cost(cell, nxt) + self.g(nxt))
+            if self.g(cell) == math.inf or cell in cells[-3:]:
+                return None
+            cells.append(cell)
+        return cells
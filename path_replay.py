@@ -0,0 +1,93 @@
+import math
+
+from motion_model import HeadingEstimator, PurePursuit, MAX_WHEEL_SPEED, PURSUIT_LOOKAHEAD
+
+# Path Replay Constants
+REPLAY_SPEED = 4.4              # Wheel speed near walls, the recorded 'F' speed [rad/s]
+REPLAY_MAX_SPEED = MAX_WHEEL_SPEED  # Time-warped wheel speed with open space ahead [rad/s]
+REPLAY_CLEARANCE_SLOW = 0.05    # Front clearance at or below which the replay runs at REPLAY_SPEED [m]
+REPLAY_CLEARANCE_FAST = 0.15    # Front clearance from which it runs at REPLAY_MAX_SPEED [m]
+REPLAY_GOAL_TOLERANCE = 0.015   # Distance to the last waypoint that completes the replay [m]
+REPLAY_MAX_DEVIATION = 0.12     # Distance off the recorded route that abandons the replay [m]
+REPLAY_MIN_SPACING = 0.01       # Waypoints closer than this to the previous one are dropped [m]
+
+
+def replay_waypoints(actions):
+    """GPS waypoints of a recorded path, None if any action was recorded without one"""
+    waypoints = []
+    for action in actions:
+        if 'x' not in action or 'z' not in action:
+            return None
+        point = (action['x'], action['z'])
+        if not waypoints or math.hypot(point[0] - waypoints[-1][0], point[1] - waypoints[-1][1]) >= REPLAY_MIN_SPACING:
+            waypoints.append(point)
+    return waypoints or None
+
+
+def distance_to_segment(x, z, a, b):
+    dx, dz = b[0] - a[0], b[1] - a[1]
+    length = dx * dx + dz * dz
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((x - a[0]) * dx + (z - a[1]) * dz) / length))
+    return math.hypot(a[0] + t * dx - x, a[1] + t * dz - z)
+
+
+class PathReplay:
+    """Closed-loop replay of a recorded path through its GPS waypoints
+
+    Instead of re-running each action for its step count, the robot
+    tracks the recorded waypoints with pure pursuit on the GPS position
+    and estimated heading, so wheel slip and timing errors do not add up
+    along the path. Speed is time-warped from REPLAY_SPEED up to
+    REPLAY_MAX_SPEED as the front clearance opens up.
+    """
+
+    def __init__(self, waypoints, speed=REPLAY_SPEED, max_speed=REPLAY_MAX_SPEED, lookahead=PURSUIT_LOOKAHEAD):
+        self.waypoints = list(waypoints)
+        self.speed = speed
+        self.max_speed = max_speed
+        self.heading = HeadingEstimator()
+        self.pursuit = PurePursuit(lookahead=lookahead, speed=speed)
+        self.pursuit.set_path(self.waypoints)
+        self.start = None           # Where the replay began, the route's first segment starts here
+        self.done = False
+        self.lost = False
+        self.deviation = 0.0
+        self.warp = 1.0             # Current speed relative to REPLAY_SPEED
+
+    def speed_for(self, clearance):
+        """Wheel speed for the free distance ahead, linear between the slow and fast clearances"""
+        if clearance is None:
+            return self.speed
+        fraction = (clearance - REPLAY_CLEARANCE_SLOW) / (REPLAY_CLEARANCE_FAST - REPLAY_CLEARANCE_SLOW)
+        return self.speed + (self.max_speed - self.speed) * max(0.0, min(1.0, fraction))
+
+    def route_deviation(self, x, z):
+        """Distance from the segment being tracked (or the one just before it)"""
+        index = self.pursuit.index
+        points = [self.start] + self.waypoints
+        return min(distance_to_segment(x, z, points[i], points[i + 1])
+                   for i in range(max(0, index - 1), index + 1))
+
+    def command(self, x, z, time, clearance=None):
+        """Wheel speeds for this step from the GPS position, (0, 0) once done or lost"""
+        if self.start is None:
+            self.start = (x, z)
+        heading = self.heading.update(x, z, time)
+        last = self.waypoints[-1]
+        if self.pursuit.index == len(self.waypoints) - 1 and \
+                math.hypot(last[0] - x, last[1] - z) < REPLAY_GOAL_TOLERANCE:
+            self.done = True
+        self.deviation = self.route_deviation(x, z)
+        if self.deviation > REPLAY_MAX_DEVIATION:
+            self.lost = True
+        if self.done or self.lost:
+            left = right = 0.0
+        elif heading is None:
+            # No heading fix yet: creep straight ahead until the GPS chord gives one
+            left = right = self.speed
+        else:
+            self.pursuit.speed = self.speed_for(clearance)
+            self.warp = self.pursuit.speed / self.speed
+            left, right = self.pursuit.command(x, z, heading)
+        self.heading.set_command(left, right)
+        return left, right
@@ -0,0 +1,92 @@
+import argparse
+import threading
+
+from audio_cache import AudioCache
+from phrase_catalog import PhraseCatalog
+from speech_backend import GTTSBackend, join_audio
+
+
+class PhraseBank:
+    """Pre-rendered audio clips for the fixed parts of a victim report.
+
+    Every label, voice line, urgency and hazard string of the current
+    catalog language is rendered once, together with the digit vocabulary
+    used to speak the coordinates. Clips live in the shared audio cache,
+    and a report is assembled by joining them instead of sending the whole
+    sentence to the TTS service. The language is passed with every call
+    and is part of each clip's key, never read from shared state, so a
+    language switch cannot mix clips between languages.
+    """
+
+    def __init__(self, catalog, audio_cache, backend):
+        self.catalog = catalog
+        self.audio_cache = audio_cache
+        self.backend = backend
+        self._generation = 0        # Bumped by build_async, an older build stops at its next clip
+
+    def clip_key(self, text, language):
+        return self.audio_cache.key(text, language, self.backend.settings())
+
+    def has_clips(self, segments, language):
+        return all(self.audio_cache.contains(self.clip_key(text, language)) for text in segments)
+
+    def build(self, phrase_set=None, generation=None):
+        """Render every missing clip of phrase_set (default: the current language), returns the number rendered"""
+        phrase_set = phrase_set or self.catalog.current
+        rendered = 0
+        segments = sorted(phrase_set.fixed_segments())
+        for text in segments:
+            if generation is not None and generation != self._generation:
+                print(f"[PHRASES] {phrase_set.language} build superseded after {rendered} clips")
+                return rendered
+            key = self.clip_key(text, phrase_set.language)
+            if self.audio_cache.lookup(key) is not None:
+                continue
+            try:
+                self.audio_cache.store(key, *self.backend.synthesize(text, phrase_set.language))
+            except Exception as e:
+                print(f"[PHRASES] Failed to render '{text}': {e}")
+                break
+            rendered += 1
+        print(f"[PHRASES] {len(segments)} {phrase_set.language} phrases, {rendered} clips rendered")
+        return rendered
+
+    def build_async(self):
+        """Render missing clips of the current language on a background thread, superseding an older build"""
+        self._generation += 1
+        thread = threading.Thread(target=self.build, args=(self.catalog.current, self._generation),
+                                  name="phrase-bank", daemon=True)
+        thread.start()
+        return thread
+
+    def assemble(self, segments, language):
+        """Join the clips for segments in memory, returns (bytes, duration, ext)
+
+        Returns None when a clip is missing so the caller can fall back to
+        synthesizing the full sentence.
+        """
+        if not self.has_clips(segments, language):
+            return None
+        clips, duration = [], 0.0
+        try:
+            for text in segments:
+                cached = self.audio_cache.read(self.clip_key(text, language))
+                if cached is None:
+                    return None
+                clips.append(cached[0])
+                duration += cached[1]
+            return join_audio(clips, self.backend.ext), duration, self.backend.ext
+        except (OSError, ValueError) as e:
+            print(f"[PHRASES] Could not assemble report: {e}")
+            return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the phrase audio bank ahead of a mission")
+    parser.add_argument("phrases", help="path to phrases.json")
+    parser.add_argument("audio_folder", help="audio cache folder used by the controller")
+    parser.add_argument("--lang", default="en", help="language to render, loads phrases.<lang>.json for non-default languages")
+    args = parser.parse_args()
+
+    bank = PhraseBank(PhraseCatalog(args.phrases, args.lang), AudioCache(args.audio_folder), GTTSBackend(args.lang))
+    bank.build()
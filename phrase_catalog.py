@@ -0,0 +1,149 @@
+import json
+import os
+import random
+import string
+from collections import namedtuple
+
+DEFAULT_LANGUAGE = 'en'
+DEFAULT_PRIORITY = 'S'          # Victim type used when a code has no entry
+# Fallbacks for phrases.json files written before "rank", "report" and "numbers" were added
+DEFAULT_RANKS = {'H': 0, 'S': 1, 'U': 2}
+DEFAULT_REPORT = (
+    "{message_line} Victim located at {x} and {z} meters.",
+    "Classification: {priority}.",
+    "Distance from robot: {proximity} meters.",
+    "{hazard}",
+    "{urgency}",
+)
+DEFAULT_NUMBERS = {
+    "0": "zero", "1": "one", "2": "two", "3": "three", "4": "four",
+    "5": "five", "6": "six", "7": "seven", "8": "eight", "9": "nine",
+    ".": "point", "-": "minus",
+}
+
+PriorityEntry = namedtuple("PriorityEntry", "code rank label voice_lines urgency")
+Report = namedtuple("Report", "label message_line urgency rank text segments")
+
+
+def _speakable(text):
+    """Literals such as "." between template fields get no clip of their own"""
+    return any(ch.isalnum() for ch in text)
+
+
+class CompiledTemplate:
+    """A report template from phrases.json, parsed once into literals and fields"""
+
+    def __init__(self, template):
+        self.template = template
+        self.parts = [(literal.strip() if _speakable(literal) else None, field_name)
+                      for literal, field_name, _, _ in string.Formatter().parse(template)]
+
+    def literals(self):
+        return [literal for literal, _ in self.parts if literal]
+
+    def format(self, fields):
+        return self.template.format(**fields).strip()
+
+    def segments(self, fields, speak_number):
+        segments = []
+        for literal, field_name in self.parts:
+            if literal:
+                segments.append(literal)
+            if field_name is None:
+                continue
+            value = fields[field_name]
+            if isinstance(value, (int, float)):
+                segments.extend(speak_number(value))
+            elif value and _speakable(str(value)):
+                segments.append(str(value).strip())
+        return segments
+
+
+class PhraseSet:
+    """All report phrases of one language, compiled from its JSON file"""
+
+    def __init__(self, language, phrases_data):
+        self.language = language
+        missing = [key for key in ("report", "numbers") if key not in phrases_data]
+        if any("rank" not in entry for entry in phrases_data["priorities"].values()):
+            missing.append("rank")
+        if missing:
+            print(f"[PHRASES] {language} phrases have no {', '.join(missing)}, using the built-in defaults")
+        self.priorities = {
+            code: PriorityEntry(code, entry.get("rank", DEFAULT_RANKS.get(code, len(DEFAULT_RANKS))), entry["label"],
+                                tuple(entry["voice_lines"]), entry["urgency"])
+            for code, entry in phrases_data["priorities"].items()
+        }
+        self.default_priority = self.priorities[DEFAULT_PRIORITY]
+        self.hazards = dict(phrases_data.get("hazards", {}))
+        self.numbers = dict(phrases_data.get("numbers", DEFAULT_NUMBERS))
+        self.templates = [CompiledTemplate(line) for line in phrases_data.get("report", DEFAULT_REPORT)]
+
+    def priority(self, type_code):
+        return self.priorities.get(type_code, self.default_priority)
+
+    def hazard(self, hazard_tag):
+        return self.hazards.get(hazard_tag, "")
+
+    def speak_number(self, value):
+        return [self.numbers[ch] for ch in str(value) if ch in self.numbers]
+
+    def fixed_segments(self):
+        """All texts that need a clip, independent of the victim position"""
+        segments = set(self.numbers.values())
+        for entry in self.priorities.values():
+            segments.add(entry.label)
+            segments.add(entry.urgency)
+            segments.update(entry.voice_lines)
+        segments.update(self.hazards.values())
+        for template in self.templates:
+            segments.update(template.literals())
+        return segments
+
+    def report(self, type_code, hazard_tag, x, z, proximity):
+        """Build the spoken report for one victim"""
+        entry = self.priority(type_code)
+        message_line = random.choice(entry.voice_lines)
+        fields = dict(message_line=message_line, x=x, z=z, priority=entry.label,
+                      proximity=proximity, hazard=self.hazard(hazard_tag), urgency=entry.urgency)
+        text = " ".join(line for line in (template.format(fields) for template in self.templates) if line)
+        segments = [segment for template in self.templates for segment in template.segments(fields, self.speak_number)]
+        return Report(entry.label, message_line, entry.urgency, entry.rank, text, segments)
+
+
+class PhraseCatalog:
+    """Report phrases for every language, loaded the first time a language is used.
+
+    The base file (phrases.json) holds the default language; other
+    languages live next to it as phrases.<language>.json. Switching back to
+    a language that was used before does not read its JSON again.
+    """
+
+    def __init__(self, base_path, language=DEFAULT_LANGUAGE, base_language=DEFAULT_LANGUAGE):
+        self.base_path = base_path
+        self.base_language = base_language
+        self._sets = {}
+        self.current = None
+        self.set_language(language)
+
+    @property
+    def language(self):
+        return self.current.language
+
+    def path_for(self, language):
+        if language == self.base_language:
+            return self.base_path
+        root, ext = os.path.splitext(self.base_path)
+        return f"{root}.{language}{ext}"
+
+    def get(self, language):
+        phrase_set = self._sets.get(language)
+        if phrase_set is None:
+            with open(self.path_for(language), 'r', encoding='utf-8') as f:
+                phrase_set = PhraseSet(language, json.load(f))
+            self._sets[language] = phrase_set
+        return phrase_set
+
+    def set_language(self, language):
+        self.current = self.get(language)
+        return self.current
@@ -0,0 +1,76 @@
+import atexit
+import csv
+import os
+import time
+
+# Report Writer Constants
+REPORT_HEADER = ["X (m)", "Z (m)", "Type", "Priority", "Hazard", "Proximity (m)", "Timestamp", "Area_Code", "Urgency_Message", "Zone"]
+REPORT_FLUSH_ROWS = 16          # Buffered rows that force a flush
+REPORT_FLUSH_INTERVAL = 2.0     # Seconds (sim time) between flushes of a non-empty buffer
+
+
+class VictimReportWriter:
+    """Long-lived writer for victim_report.csv.
+
+    Keeps a single file handle open for the whole mission and buffers rows
+    in memory. The buffer is written out once it holds flush_rows rows,
+    once flush_interval seconds have passed or when the writer is closed.
+    Every flush reaches the OS, so rows survive the controller being killed
+    by a Webots reset; sync() additionally forces them onto the disk.
+    """
+
+    def __init__(self, csv_path, clock=None, append=False, header=REPORT_HEADER,
+                 flush_rows=REPORT_FLUSH_ROWS, flush_interval=REPORT_FLUSH_INTERVAL):
+        self.csv_path = csv_path
+        self.clock = clock or time.monotonic
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._rows = []
+        self._last_flush = self.clock()
+
+        write_header = not append or not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        self._file = open(self.csv_path, mode='a' if append else 'w', newline='')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(header)
+            self._file.flush()
+        atexit.register(self.close)
+
+    def write_row(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+        else:
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        """Flush when the sim-time interval has elapsed, cheap enough to call every step"""
+        if self._rows and self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._file is None:
+            return
+        if self._rows:
+            self._writer.writerows(self._rows)
+            self.rows_written += len(self._rows)
+            self._rows = []
+        self._file.flush()
+        self._last_flush = self.clock()
+
+    def sync(self):
+        """Flush and force the rows onto the disk"""
+        self.flush()
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.sync()
+        finally:
+            self._file.close()
+            self._file = None
+            atexit.unregister(self.close)
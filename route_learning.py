@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+
+# Route Learning Constants
+ROUTE_SAMPLE_SPACING = 0.01     # GPS trajectory is logged every this many metres
+ROUTE_LOOP_RADIUS = 0.03        # Coming back this close to an earlier sample cuts the loop in between [m]
+ROUTE_LOOP_MIN_LENGTH = 0.1     # ...if at least this much path was driven since that sample [m]
+ROUTE_SIMPLIFY_TOLERANCE = 0.02  # Douglas-Peucker: samples within this of the shortcut are dropped [m]
+
+
+class TrajectoryLog:
+    """GPS samples of the driven path, one every ROUTE_SAMPLE_SPACING metres
+
+    anchors holds the indices of samples the learned route must keep,
+    such as the places where targets were reached.
+    """
+
+    def __init__(self, spacing=ROUTE_SAMPLE_SPACING):
+        self.spacing = spacing
+        self.points = []
+        self.anchors = []
+
+    def record(self, x, z):
+        if math.isnan(x) or math.isnan(z):
+            return
+        if not self.points or math.hypot(x - self.points[-1][0], z - self.points[-1][1]) >= self.spacing:
+            self.points.append((x, z))
+
+    def mark(self, x, z):
+        """Log this position whatever the spacing and anchor it, e.g. where a target was reached"""
+        if math.isnan(x) or math.isnan(z):
+            return
+        self.points.append((x, z))
+        self.anchors.append(len(self.points) - 1)
+
+    def clear(self):
+        self.points = []
+        self.anchors = []
+
+
+def prune_loops(points, radius=ROUTE_LOOP_RADIUS, min_length=ROUTE_LOOP_MIN_LENGTH, anchors=()):
+    """Drop detours that come back to where they started (back-offs, recovery, dead ends)
+
+    Samples are hashed into radius-sized cells, so each sample only checks
+    its 3x3 neighbourhood for an earlier sample to close a loop with. No
+    cut removes an anchor (indices into points), so a dead end driven to
+    reach a target stays in the route. Returns the route and the indices
+    of the anchors in it.
+    """
+    anchors = set(anchors)
+    route, lengths, cells, kept = [], [], {}, []
+    for source, point in enumerate(points):
+        travelled = lengths[-1] + math.hypot(point[0] - route[-1][0], point[1] - route[-1][1]) if route else 0.0
+        cell = (math.floor(point[0] / radius), math.floor(point[1] / radius))
+        earliest = None
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for index, sample in cells.get((cell[0] + di, cell[1] + dj), ()):
+                    # Entries of samples removed by an earlier cut are stale
+                    if index < len(route) and route[index] is sample and \
+                            (not kept or index >= kept[-1]) and \
+                            travelled - lengths[index] >= min_length and \
+                            math.hypot(point[0] - sample[0], point[1] - sample[1]) <= radius and \
+                            (earliest is None or index < earliest):
+                        earliest = index
+        if earliest is not None:
+            del route[earliest + 1:]
+            del lengths[earliest + 1:]
+            travelled = lengths[-1] + math.hypot(point[0] - route[-1][0], point[1] - route[-1][1])
+        route.append(point)
+        lengths.append(travelled)
+        cells.setdefault(cell, []).append((len(route) - 1, point))
+        if source in anchors:
+            kept.append(len(route) - 1)
+    return route, kept
+
+
+def douglas_peucker(points, tolerance=ROUTE_SIMPLIFY_TOLERANCE, is_clear=None, anchors=()):
+    """Fewest samples that keep the path within tolerance
+
+    is_clear(a, b) can veto a shortcut, e.g. one that would cut through a
+    sensed wall; the farthest sample between a and b is then kept too.
+    Anchors (indices into points) are always kept.
+    """
+    if len(points) < 3:
+        return list(points)
+    samples = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    keep[list(anchors)] = True
+    fixed = np.flatnonzero(keep)
+    stack = [(int(first), int(last)) for first, last in zip(fixed[:-1], fixed[1:])]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = samples[first], samples[last]
+        inner = samples[first + 1:last]
+        direction = b - a
+        length = float(direction @ direction)
+        t = np.zeros(len(inner)) if length == 0 else np.clip((inner - a) @ direction / length, 0.0, 1.0)
+        distances = np.hypot(*(a + t[:, None] * direction - inner).T)
+        index = first + 1 + int(np.argmax(distances))
+        if distances.max() > tolerance or (is_clear is not None and not is_clear(points[first], points[last])):
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_route(points, is_clear=None, tolerance=ROUTE_SIMPLIFY_TOLERANCE, anchors=()):
+    """Minimal waypoint list for a logged trajectory: loops cut, then Douglas-Peucker, anchors kept"""
+    route, kept = prune_loops(points, anchors=anchors)
+    return douglas_peucker(route, tolerance, is_clear, kept)
@@ -0,0 +1,62 @@
+from camera_view import CameraView
+
+
+class SensorFrame:
+    """Device readings captured once after a robot.step
+
+    Each device read crosses into the simulator and getImage() copies the
+    whole image, so the controller reads every device exactly once per
+    step and the detectors and planners all work from this snapshot.
+    Images are kept as the raw BGRA bytes Webots returns.
+    """
+
+    def __init__(self, time, position, ranges, colour, camera_image, camera_width, camera_height, encoders=None):
+        self.time = time
+        self.position = position            # GPS (x, z)
+        self.ranges = ranges                # ps0..ps7
+        self.colour = colour                # (r, g, b) under the colour sensor
+        self.camera_image = camera_image
+        self.camera_width = camera_width
+        self.camera_height = camera_height
+        self.encoders = encoders            # (left, right) wheel positions [rad], None without encoders
+        self._readings = None
+        self._camera_view = None
+
+    @classmethod
+    def capture(cls, robot, gps, distance_sensors, color_sensor, camera, encoders=None):
+        values = gps.getValues()
+        image = color_sensor.getImage()
+        colour = (image[2], image[1], image[0]) if image else (0, 0, 0)
+        return cls(robot.getTime(),
+                   (values[0], values[2]),
+                   tuple(sensor.getValue() for sensor in distance_sensors),
+                   colour,
+                   camera.getImage(),
+                   camera.getWidth(),
+                   camera.getHeight(),
+                   tuple(encoder.getValue() for encoder in encoders) if encoders else None)
+
+    def readings(self):
+        """Closest range per side, the same groups as ErebusController.get_sensor_readings"""
+        if self._readings is None:
+            ranges = self.ranges
+            self._readings = {
+                'front_left': ranges[0],
+                'front_right': ranges[7],
+                'left': min(ranges[5], ranges[6]),
+                'right': min(ranges[1], ranges[2]),
+            }
+        return self._readings
+
+    def camera_view(self):
+        """NumPy CameraView over the camera buffer, None if there is no image"""
+        if self._camera_view is None and self.camera_image:
+            self._camera_view = CameraView(self.camera_image, self.camera_width, self.camera_height)
+        return self._camera_view
+
+    def camera_centre(self):
+        """(r, g, b) of the centre camera pixel"""
+        view = self.camera_view()
+        if view is None:
+            return (0, 0, 0)
+        return view.pixel(self.camera_width // 2, self.camera_height // 2)
@@ -0,0 +1,115 @@
+import heapq
+import itertools
+import threading
+import time
+
+# Speaker Scheduler Constants
+SPEAKER_QUEUE_SIZE = 8          # Pending reports kept before the least urgent one is dropped
+NO_HAZARD_RANK = 1              # Reports with a hazard (rank 0) go before those without
+
+
+def report_priority(rank, hazard_tag):
+    """Sort key for a report: victim class rank from phrases.json, then hazard"""
+    return rank, 0 if hazard_tag else NO_HAZARD_RANK
+
+
+class SpeechRequest:
+    def __init__(self, priority, sequence, enqueued_at, text, name, segments, language=None):
+        self.priority = priority
+        self.sequence = sequence
+        self.enqueued_at = enqueued_at
+        self.text = text
+        self.name = name
+        self.segments = segments
+        self.language = language        # Rendered in this language whatever the reporter switches to later
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class SpeakerScheduler:
+    """Bounded priority queue of reports waiting for the speaker.
+
+    Lower priority tuples are spoken first, ties keep arrival order. When
+    the queue is full the least urgent report is dropped, which may be the
+    one being submitted. Wait times (enqueue to playback) are tracked so
+    the controller can see how far behind the speaker is.
+    """
+
+    def __init__(self, clock=None, max_size=SPEAKER_QUEUE_SIZE):
+        self.clock = clock or time.monotonic
+        self.max_size = max_size
+        self.dropped = 0
+        self.preempted = 0
+        self.max_depth = 0
+        self.spoken = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._heap = []
+        self._sequence = itertools.count()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def submit(self, text, name, segments=None, priority=(0, 0), language=None):
+        """Queue a report, returns False if it was dropped to make room"""
+        request = SpeechRequest(priority, next(self._sequence), self.clock(), text, name, segments, language)
+        with self._cond:
+            if len(self._heap) >= self.max_size:
+                worst = max(self._heap)
+                if request > worst:
+                    self.dropped += 1
+                    print(f"[SPEECH] Queue full - dropping {name}")
+                    return False
+                self._heap.remove(worst)
+                heapq.heapify(self._heap)
+                self.dropped += 1
+                print(f"[SPEECH] Queue full - dropping {worst.name}")
+            heapq.heappush(self._heap, request)
+            self.max_depth = max(self.max_depth, len(self._heap))
+            self._cond.notify()
+        return True
+
+    def requeue(self, request):
+        """Put back a request that was pre-empted or overtaken, keeping its place"""
+        with self._cond:
+            heapq.heappush(self._heap, request)
+            self._cond.notify()
+
+    def get(self):
+        """Block until a report is available, returns None once closed"""
+        with self._cond:
+            while not self._heap and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            return heapq.heappop(self._heap)
+
+    def peek_priority(self):
+        with self._cond:
+            return self._heap[0].priority if self._heap else None
+
+    def started(self, request):
+        """Record that a request has been handed to the speaker"""
+        wait = self.clock() - request.enqueued_at
+        self.spoken += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "depth": len(self._heap),
+            "max_depth": self.max_depth,
+            "spoken": self.spoken,
+            "dropped": self.dropped,
+            "preempted": self.preempted,
+            "mean_wait": self.total_wait / self.spoken if self.spoken else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,151 @@
+import io
+import struct
+import subprocess
+
+from gtts import gTTS
+
+DEFAULT_VOICE = {"tld": "com", "slow": False}   # gTTS voice settings, part of the cache key
+
+# MPEG audio frame header tables, indexed by the header bit fields
+_MPEG_BITRATES = {   # (version is MPEG1, layer) -> kbit/s by bitrate index
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def strip_id3(data):
+    """Drop a leading ID3v2 tag so mp3 data can be joined frame to frame"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return data[10 + size:]
+    return data
+
+
+def mp3_duration(data):
+    """Exact duration of an mp3 in seconds, from the frame headers
+
+    Walks the frame chain and adds up samples per frame / sample rate, so
+    the result does not depend on a decoder's bitrate estimate. A leading
+    Xing/Info frame carries no audio and is not counted.
+    """
+    data = strip_id3(data)
+    pos, duration, first = 0, 0.0, True
+    while pos + 4 <= len(data):
+        header = struct.unpack(">I", data[pos:pos + 4])[0]
+        version_bits = (header >> 19) & 0x3
+        layer = 4 - ((header >> 17) & 0x3)
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        if ((header >> 21) & 0x7FF) != 0x7FF or version_bits == 1 or layer == 4 \
+                or bitrate_index in (0, 15) or rate_index == 3:
+            pos += 1    # Not a frame header, resync
+            continue
+        mpeg1 = version_bits == 3
+        bitrate = _MPEG_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        sample_rate = _MPEG_SAMPLE_RATES[version_bits][rate_index]
+        padding = (header >> 9) & 0x1
+        if layer == 1:
+            samples, length = 384, (12 * bitrate // sample_rate + padding) * 4
+        elif layer == 2 or mpeg1:
+            samples, length = 1152, 144 * bitrate // sample_rate + padding
+        else:
+            samples, length = 576, 72 * bitrate // sample_rate + padding
+        frame = data[pos:pos + length]
+        if not (first and (b"Xing" in frame[:64] or b"Info" in frame[:64])):
+            duration += samples / sample_rate
+        first = False
+        pos += length
+    return duration
+
+
+def _wav_chunks(data):
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE stream")
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = struct.unpack("<4sI", data[pos:pos + 8])
+        # Streamed WAV output (e.g. espeak --stdout) cannot know the data size up front
+        if chunk_id == b"data" and (size == 0 or pos + 8 + size > len(data)):
+            size = len(data) - pos - 8
+        yield chunk_id, data[pos + 8:pos + 8 + size]
+        pos += 8 + size + (size & 1)
+
+
+def _wav_parts(data):
+    fmt, pcm = None, b""
+    for chunk_id, chunk in _wav_chunks(data):
+        if chunk_id == b"fmt ":
+            fmt = chunk[:16]
+        elif chunk_id == b"data":
+            pcm = chunk
+    if fmt is None:
+        raise ValueError("WAVE stream without a fmt chunk")
+    return fmt, pcm
+
+
+def wav_duration(data):
+    """Exact duration of a PCM wav in seconds, from its sample count"""
+    fmt, pcm = _wav_parts(data)
+    _, channels, sample_rate, _, block_align, _ = struct.unpack("<HHIIHH", fmt)
+    return (len(pcm) // block_align) / sample_rate
+
+
+def join_audio(clips, ext):
+    """Concatenate clips of the same format into one stream"""
+    if ext == ".mp3":
+        return b"".join(strip_id3(clip) for clip in clips)
+    fmt, pcm = None, []
+    for clip in clips:
+        clip_fmt, clip_pcm = _wav_parts(clip)
+        if fmt is not None and clip_fmt != fmt:
+            raise ValueError("cannot join wav clips with different formats")
+        fmt = clip_fmt
+        pcm.append(clip_pcm)
+    pcm = b"".join(pcm)
+    return b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVE" + b"fmt " + struct.pack("<I", 16) + fmt \
+        + b"data" + struct.pack("<I", len(pcm)) + pcm
+
+
+class GTTSBackend:
+    """Google TTS over the network, returns mp3 bytes"""
+
+    ext = ".mp3"
+
+    def __init__(self, language='en', voice=None):
+        self.language = language
+        self.voice = voice or DEFAULT_VOICE
+
+    def settings(self):
+        return dict(self.voice, engine="gtts")
+
+    def synthesize(self, text, language=None):
+        """Return (audio bytes, duration in seconds, file extension)"""
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language or self.language, **self.voice).write_to_fp(buffer)
+        data = buffer.getvalue()
+        return data, mp3_duration(data), self.ext
+
+
+class EspeakBackend:
+    """Offline espeak-ng synthesis, returns PCM wav bytes"""
+
+    ext = ".wav"
+
+    def __init__(self, language='en', voice=None, executable="espeak-ng"):
+        self.language = language
+        self.voice = voice or {"speed": 160}
+        self.executable = executable
+
+    def settings(self):
+        return dict(self.voice, engine="espeak")
+
+    def synthesize(self, text, language=None):
+        """Return (audio bytes, duration in seconds, file extension)"""
+        command = [self.executable, "--stdout", "-v", language or self.language, "-s", str(self.voice["speed"]), text]
+        data = subprocess.run(command, check=True, capture_output=True).stdout
+        return data, wav_duration(data), self.ext
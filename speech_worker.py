@@ -0,0 +1,111 @@
+import heapq
+import queue
+import threading
+import time
+
+from speaker_scheduler import SPEAKER_QUEUE_SIZE, SpeakerScheduler
+
+
+class SpeechWorker:
+    """Synthesizes victim reports on a background thread, plays them from the control loop.
+
+    The control loop calls say(), which hands the text to the speaker
+    scheduler and returns immediately. The worker takes the most urgent
+    report, looks it up in the audio cache and renders it on a miss (from
+    phrase bank clips when they are available), then pushes the file onto
+    a ready queue. The speaker is only ever touched by tick(), called from
+    the control loop between robot.step calls, because the Webots
+    controller library is not thread-safe. With preempt set, a more urgent
+    report stops less urgent speech, which is queued again to be repeated
+    later.
+    """
+
+    def __init__(self, speaker, audio_cache, backend, clock=None, queue_size=SPEAKER_QUEUE_SIZE,
+                 phrase_bank=None, preempt=False):
+        self.speaker = speaker
+        self.audio_cache = audio_cache
+        self.backend = backend
+        self.phrase_bank = phrase_bank
+        self.preempt = preempt
+        self.clock = clock or time.monotonic     # Only called from the control loop
+        self.scheduler = SpeakerScheduler(self.clock, queue_size)
+        self.audio_end_time = 0
+        self.now = 0
+        self.current = None
+        self._current_path = None
+        self._working = False
+        self._ready = queue.Queue()             # (path, duration, request) from the worker
+        self._pending = []                      # Rendered reports waiting for the speaker, by priority
+        self._thread = threading.Thread(target=self._run, name="speech-worker", daemon=True)
+        self._thread.start()
+
+    def say(self, text, name, segments=None, priority=(0, 0), language=None):
+        """Queue a message for playback in language (default: the backend's), False if it had to be dropped"""
+        return self.scheduler.submit(text, name, segments, priority, language or self.backend.language)
+
+    def is_busy(self):
+        """True while reports are queued, being synthesized, waiting to play or still playing"""
+        return (len(self.scheduler) > 0 or self._working or not self._ready.empty() or bool(self._pending)
+                or self.now < self.audio_end_time)
+
+    def stats(self):
+        return self.scheduler.stats()
+
+    def tick(self, now=None):
+        """Start the most urgent rendered report once the speaker is free; call from the control loop only"""
+        self.now = self.clock() if now is None else now
+        while True:
+            try:
+                path, duration, request = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            heapq.heappush(self._pending, (request, path, duration))
+        if not self._pending:
+            return
+        request, path, duration = self._pending[0]
+        if self.now < self.audio_end_time:
+            if not self.preempt or not request.priority < self.current.priority:
+                return
+            print(f"[SPEECH] {request.name} pre-empts {self.current.name}")
+            self.speaker.stop(self._current_path)
+            self.scheduler.preempted += 1
+            self.scheduler.requeue(self.current)
+        heapq.heappop(self._pending)
+        self.speaker.playSound(self.speaker, self.speaker, path, 1.0, 1.0, 0.0, False)
+        self.scheduler.started(request)
+        self.current = request
+        self._current_path = path
+        self.audio_end_time = self.now + duration
+
+    def close(self, timeout=None):
+        """Stop the worker; reports not yet handed to the speaker are dropped"""
+        self.scheduler.close()
+        self._thread.join(timeout)
+        self.audio_cache.save_index()
+
+    def _run(self):
+        while True:
+            request = self.scheduler.get()
+            if request is None:
+                return
+            self._working = True
+            try:
+                path, duration = self._synthesize(request)
+                self._ready.put((path, duration, request))
+            except Exception as e:
+                print(f"[SPEECH] Failed to render {request.name}: {e}")
+            finally:
+                self._working = False
+
+    def _render(self, text, segments, language):
+        rendered = None
+        if self.phrase_bank is not None and segments:
+            rendered = self.phrase_bank.assemble(segments, language)
+        if rendered is None:
+            rendered = self.backend.synthesize(text, language)
+        return rendered
+
+    def _synthesize(self, request):
+        # Audio is written to the cache once, its duration comes from the stream headers
+        key = self.audio_cache.key(request.text, request.language, self.backend.settings())
+        return self.audio_cache.get_or_render(key, lambda: self._render(request.text, request.segments, request.language))
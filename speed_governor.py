@@ -0,0 +1,74 @@
+import math
+
+# Speed Governor Constants (clearances are distance sensor ranges [m])
+GOVERNOR_MIN_SCALE = 0.35       # Cap relative to the top speed in the tightest spots
+GOVERNOR_FRONT_SLOW = 0.02      # Front clearance at or below which the cap is at its minimum
+GOVERNOR_FRONT_FAST = 0.07      # Front clearance from which the front sensors allow top speed (~0.078 centred in a corridor)
+GOVERNOR_SIDE_SLOW = 0.005      # Same for the side sensors, walls alongside matter less
+GOVERNOR_SIDE_FAST = 0.02       # ~0.023 centred in a 12 cm corridor
+GOVERNOR_COLLISION_DISTANCE = 0.008  # Front clearance counted as a collision
+GOVERNOR_EVENT_SCALE = 0.5      # Cap right after a collision or stuck event...
+GOVERNOR_EVENT_RECOVERY = 4.0   # ...back to full over this many seconds
+GOVERNOR_RISE_RATE = 8.0        # Cap may rise this fast [rad/s per s], it drops at once
+FLOOR_SCALES = {                # Cap per floor type under the colour sensor
+    'normal': 1.0,
+    'hole': 0.5,
+    'trap': 0.5,
+}
+
+
+def ramp(value, slow, fast):
+    """0 at or below slow, 1 at or above fast, linear in between"""
+    return max(0.0, min(1.0, (value - slow) / (fast - slow)))
+
+
+class SpeedGovernor:
+    """Wheel speed cap from clearance, recent collision/stuck events and floor type
+
+    update() runs once per step; limit() scales a wheel command down to the
+    cap, keeping the left/right ratio so the turn radius is unchanged. In
+    open space the cap is the top speed, near walls it falls towards
+    GOVERNOR_MIN_SCALE of it. Front clearance and hazard floors only cap
+    commands that drive forwards, so backing away from a wall or off a
+    trap runs at full speed.
+    """
+
+    def __init__(self, max_speed):
+        self.max_speed = max_speed
+        self.cap = max_speed * GOVERNOR_MIN_SCALE           # Driving forwards
+        self.reverse_cap = max_speed * GOVERNOR_MIN_SCALE   # Backing up or turning on the spot
+        self.last_event = -math.inf
+        self.events = 0
+        self._last_time = None
+        self._in_collision = False
+
+    def note_event(self, time):
+        """A collision or stuck event, speeds stay lower for a while"""
+        self.last_event = time
+        self.events += 1
+
+    def update(self, front, side, floor, time):
+        collision = front < GOVERNOR_COLLISION_DISTANCE
+        if collision and not self._in_collision:
+            self.note_event(time)
+        self._in_collision = collision
+        event = min(1.0, (time - self.last_event) / GOVERNOR_EVENT_RECOVERY)
+        reverse = min(ramp(side, GOVERNOR_SIDE_SLOW, GOVERNOR_SIDE_FAST),
+                      GOVERNOR_EVENT_SCALE + (1.0 - GOVERNOR_EVENT_SCALE) * event)
+        forward = min(reverse, ramp(front, GOVERNOR_FRONT_SLOW, GOVERNOR_FRONT_FAST), FLOOR_SCALES.get(floor, 1.0))
+        dt = 0.0 if self._last_time is None else max(time - self._last_time, 0.0)
+        self._last_time = time
+        self.cap = min(self._scaled(forward), self.cap + GOVERNOR_RISE_RATE * dt)
+        self.reverse_cap = min(self._scaled(reverse), self.reverse_cap + GOVERNOR_RISE_RATE * dt)
+        return self.cap
+
+    def _scaled(self, scale):
+        return self.max_speed * (GOVERNOR_MIN_SCALE + (1.0 - GOVERNOR_MIN_SCALE) * scale)
+
+    def limit(self, left, right):
+        cap = self.cap if left + right > 0 else self.reverse_cap
+        fastest = max(abs(left), abs(right))
+        if fastest <= cap:
+            return left, right
+        scale = cap / fastest
+        return left * scale, right * scale
@@ -0,0 +1,163 @@
+import itertools
+import math
+
+from path_planner import astar
+
+# Tour Planner Constants
+HELD_KARP_MAX_TARGETS = 10      # Up to this many targets the visiting order is solved exactly
+OR_OPT_MAX_SEGMENT = 3          # Longest run of targets Or-opt tries to move elsewhere
+IMPROVEMENT_EPSILON = 1e-9
+MAP_DISTANCE_SEARCHES = 2       # A* searches allowed per tour plan, each can take tens of ms on a full grid
+
+
+def euclidean(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+class MapDistance:
+    """Path-length estimate between two points from the occupancy grid
+
+    Points with a clear line of sight are Euclidean; otherwise the A*
+    route length is used. Walled-off pairs are math.inf. Lengths are
+    cached per cell pair until the grid changes, and at most
+    max_searches new A* searches run between calls to allow(); pairs
+    over that budget fall back to Euclidean, so a tour plan never stalls
+    the control step for long.
+    """
+
+    def __init__(self, grid, max_searches=MAP_DISTANCE_SEARCHES):
+        self.grid = grid
+        self.max_searches = max_searches
+        self.searches_left = max_searches
+        self.estimated = 0          # Pairs that fell back to Euclidean for lack of budget
+        self._cache = {}
+        self._revision = getattr(grid, 'revision', None)
+
+    def allow(self, searches=None):
+        """Reset the A* budget, e.g. before planning a tour"""
+        self.searches_left = self.max_searches if searches is None else searches
+
+    def line_of_sight(self, a, b):
+        steps = max(1, int(euclidean(a, b) / (self.grid.cell_size / 2)))
+        for k in range(steps + 1):
+            cell = self.grid.cell_of(a[0] + (b[0] - a[0]) * k / steps, a[1] + (b[1] - a[1]) * k / steps)
+            if self.grid.is_blocked(cell):
+                return False
+        return True
+
+    def __call__(self, a, b):
+        if not self.grid.blocked_cells or self.line_of_sight(a, b):
+            return euclidean(a, b)
+        revision = getattr(self.grid, 'revision', None)
+        if revision != self._revision:
+            self._cache.clear()
+            self._revision = revision
+        key = (self.grid.cell_of(*a), self.grid.cell_of(*b))
+        if key not in self._cache:
+            if self.searches_left <= 0:
+                self.estimated += 1
+                return euclidean(a, b)
+            self.searches_left -= 1
+            cells = astar(self.grid, *key)
+            if cells is None:
+                self._cache[key] = math.inf
+            else:
+                self._cache[key] = self.grid.cell_size * sum(euclidean(p, q) for p, q in zip(cells, cells[1:]))
+        return self._cache[key]
+
+
+def tour_length(order, matrix):
+    """Length of start (node 0) -> targets in order, the robot does not return"""
+    length, previous = 0.0, 0
+    for node in order:
+        length += matrix[previous][node]
+        previous = node
+    return length
+
+
+def held_karp(matrix, nodes):
+    """Exact shortest open tour from node 0 through all nodes (O(2^n n^2))"""
+    n = len(nodes)
+    best = {}
+    for i, node in enumerate(nodes):
+        best[(1 << i, i)] = (matrix[0][node], None)
+    for size in range(2, n + 1):
+        for subset in itertools.combinations(range(n), size):
+            mask = sum(1 << i for i in subset)
+            for last in subset:
+                previous_mask = mask & ~(1 << last)
+                best[(mask, last)] = min(
+                    (best[(previous_mask, k)][0] + matrix[nodes[k]][nodes[last]], k)
+                    for k in subset if k != last)
+    full = (1 << n) - 1
+    last = min(range(n), key=lambda i: best[(full, i)][0])
+    order, mask = [], full
+    while last is not None:
+        order.append(nodes[last])
+        mask, last = mask & ~(1 << last), best[(mask, last)][1]
+    return order[::-1]
+
+
+def nearest_neighbour(matrix, nodes):
+    order, remaining, current = [], set(nodes), 0
+    while remaining:
+        current = min(remaining, key=lambda node: (matrix[current][node], node))
+        order.append(current)
+        remaining.remove(current)
+    return order
+
+
+def two_opt(order, matrix):
+    """Reverse sub-runs while that shortens the open tour"""
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(order) - 1):
+            before = order[i - 1] if i else 0
+            for j in range(i + 1, len(order)):
+                after = order[j + 1] if j + 1 < len(order) else None
+                old = matrix[before][order[i]] + (matrix[order[j]][after] if after is not None else 0.0)
+                new = matrix[before][order[j]] + (matrix[order[i]][after] if after is not None else 0.0)
+                if new < old - IMPROVEMENT_EPSILON:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def or_opt(order, matrix):
+    """Move runs of up to OR_OPT_MAX_SEGMENT targets (either direction) while that shortens the tour"""
+    improved = True
+    while improved:
+        improved = False
+        best_length = tour_length(order, matrix)
+        for size in range(1, OR_OPT_MAX_SEGMENT + 1):
+            for i in range(len(order) - size + 1):
+                segment = order[i:i + size]
+                rest = order[:i] + order[i + size:]
+                for j in range(len(rest) + 1):
+                    for candidate in (segment, segment[::-1]):
+                        trial = rest[:j] + candidate + rest[j:]
+                        length = tour_length(trial, matrix)
+                        if length < best_length - IMPROVEMENT_EPSILON:
+                            order, best_length, improved = trial, length, True
+    return order
+
+
+def plan_tour(start, targets, distance=euclidean, indices=None):
+    """Visiting order (indices into targets) that keeps the robot's total travel short
+
+    Exact for up to HELD_KARP_MAX_TARGETS targets, otherwise nearest
+    neighbour improved with 2-opt and Or-opt. indices limits the tour to
+    some of the targets.
+    """
+    indices = list(range(len(targets))) if indices is None else list(indices)
+    if len(indices) <= 1:
+        return indices
+    points = [start] + [targets[i] for i in indices]
+    matrix = [[0.0 if a is b else distance(a, b) for b in points] for a in points]
+    nodes = list(range(1, len(points)))
+    if len(nodes) <= HELD_KARP_MAX_TARGETS:
+        order = held_karp(matrix, nodes)
+    else:
+        order = or_opt(two_opt(nearest_neighbour(matrix, nodes), matrix), matrix)
+    return [indices[node - 1] for node in order]
@@ -0,0 +1,54 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from colour_lut import CLASS_IDS
+
+# Victim Candidate Constants
+CANDIDATE_CLASSES = ('victim', 'hazmat')    # Camera colour classes a sign can be made of
+CANDIDATE_MIN_AREA = 12         # Blobs with fewer pixels are noise
+CANDIDATE_MAX_FRACTION = 0.5    # Blobs covering more of the frame are a lit wall, not a sign
+CANDIDATE_MIN_ASPECT = 0.4      # Bounding box width / height, signs are roughly square
+CANDIDATE_MAX_ASPECT = 2.5
+CANDIDATE_MIN_FILL = 0.25       # Blob pixels / bounding box pixels
+CANDIDATE_PADDING = 0.2         # Box grown by this fraction of its size on each side before cropping
+CANDIDATE_SIZE = 32             # Crops are resized to CANDIDATE_SIZE x CANDIDATE_SIZE
+CANDIDATE_LIMIT = 4             # Largest blobs kept per frame
+
+VictimCandidate = namedtuple("VictimCandidate", "x y width height area crop")
+
+
+def candidate_mask(view, lut, classes=CANDIDATE_CLASSES):
+    """uint8 mask of camera pixels whose colour class can belong to a sign"""
+    labels = lut.segment(view.pixels, 'camera')
+    return np.isin(labels, [CLASS_IDS[name] for name in classes]).astype(np.uint8)
+
+
+def extract_candidates(view, lut, classes=CANDIDATE_CLASSES, size=CANDIDATE_SIZE, limit=CANDIDATE_LIMIT):
+    """Sign-sized blobs in a CameraView as fixed-size BGRA crops, largest first
+
+    Connected components run on the colour-class mask; blobs that are too
+    small, too large, too elongated or too sparse are dropped, so the
+    letter classifier only sees frames that actually show a sign.
+    """
+    mask = candidate_mask(view, lut, classes)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    max_area = CANDIDATE_MAX_FRACTION * view.width * view.height
+    blobs = []
+    for x, y, width, height, area in stats[1:count]:
+        if area < CANDIDATE_MIN_AREA or area > max_area:
+            continue
+        if not CANDIDATE_MIN_ASPECT <= width / height <= CANDIDATE_MAX_ASPECT:
+            continue
+        if area < CANDIDATE_MIN_FILL * width * height:
+            continue
+        blobs.append((int(area), int(x), int(y), int(width), int(height)))
+    candidates = []
+    for area, x, y, width, height in sorted(blobs, reverse=True)[:limit]:
+        pad_x, pad_y = int(width * CANDIDATE_PADDING), int(height * CANDIDATE_PADDING)
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1, y1 = min(view.width, x + width + pad_x), min(view.height, y + height + pad_y)
+        crop = cv2.resize(np.ascontiguousarray(view.pixels[y0:y1, x0:x1]), (size, size), interpolation=cv2.INTER_AREA)
+        candidates.append(VictimCandidate(x, y, width, height, area, crop))
+    return candidates
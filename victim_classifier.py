@@ -0,0 +1,280 @@
+import json
+import math
+import os
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Victim Classifier Constants
+MODEL_BASENAME = "victim_model"     # victim_model.npz / .tflite / .keras / .h5 next to the controller
+MIN_CONFIDENCE = 0.6                # Predictions below this are reported as no letter
+SKIPPED_LAYERS = ('InputLayer', 'Dropout', 'RandomFlip', 'RandomRotation', 'RandomZoom',
+                  'RandomTranslation', 'RandomContrast')   # Identity at inference time
+
+
+def load_labels(labels_path):
+    """Class names in model output order; hidden names such as .ipynb_checkpoints keep their slot"""
+    with open(labels_path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def activate(x, activation):
+    if activation in (None, 'linear'):
+        return x
+    if activation == 'relu':
+        return np.maximum(x, 0.0)
+    if activation == 'sigmoid':
+        return 1.0 / (1.0 + np.exp(-x))
+    if activation == 'softmax':
+        e = np.exp(x - x.max(axis=-1, keepdims=True))
+        return e / e.sum(axis=-1, keepdims=True)
+    raise ValueError(f"unsupported activation {activation!r}")
+
+
+def same_padding(x, kernel, strides, value=0.0):
+    """Padding with value that gives Keras 'same' output sizes"""
+    pads = [(0, 0)]
+    for size, k, s in zip(x.shape[1:3], kernel, strides):
+        total = max((math.ceil(size / s) - 1) * s + k - size, 0)
+        pads.append((total // 2, total - total // 2))
+    return np.pad(x, pads + [(0, 0)], constant_values=value)
+
+
+def conv2d(x, kernel, bias, strides, padding):
+    """NHWC convolution as one tensordot over strided windows (no Python loop over pixels)"""
+    kh, kw = kernel.shape[:2]
+    if padding == 'same':
+        x = same_padding(x, (kh, kw), strides)
+    windows = sliding_window_view(x, (kh, kw), axis=(1, 2))[:, ::strides[0], ::strides[1]]
+    return np.tensordot(windows, kernel, axes=([3, 4, 5], [2, 0, 1])) + bias
+
+
+def pool2d(x, size, strides, padding, reduce):
+    """Max (reduce=np.max) or average (np.mean) pooling; like Keras, padded cells never count"""
+    def windows(values):
+        return sliding_window_view(values, size, axis=(1, 2))[:, ::strides[0], ::strides[1]]
+
+    if padding != 'same':
+        return reduce(windows(x), axis=(-2, -1))
+    if reduce is np.max:
+        return windows(same_padding(x, size, strides, -np.inf)).max(axis=(-2, -1))
+    valid = windows(same_padding(np.ones_like(x[:1, ..., :1]), size, strides)).sum(axis=(-2, -1))
+    return windows(same_padding(x, size, strides)).sum(axis=(-2, -1)) / valid
+
+
+class NumpyModel:
+    """Forward pass of a small Keras image classifier in plain NumPy
+
+    The model is stored as victim_model.npz: a JSON layer list plus the
+    weights, exported once from Keras by export_keras(). Running it needs
+    neither TensorFlow nor a GPU.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.layers = json.loads(str(data['config']))
+            self.weights = {key: data[key] for key in data.files if key != 'config'}
+        self.input_shape = tuple(self.layers[0]['input_shape'])
+
+    def predict(self, batch):
+        x = batch.astype(np.float32)
+        for i, layer in enumerate(self.layers[1:], start=1):
+            kind = layer['type']
+            if kind == 'rescale':
+                x = x * layer['scale'] + layer['offset']
+            elif kind == 'affine':
+                x = x * self.weights[f"{i}_scale"] + self.weights[f"{i}_offset"]
+            elif kind == 'conv2d':
+                x = conv2d(x, self.weights[f"{i}_kernel"], self.weights[f"{i}_bias"], layer['strides'], layer['padding'])
+            elif kind == 'maxpool':
+                x = pool2d(x, layer['size'], layer['strides'], layer['padding'], np.max)
+            elif kind == 'avgpool':
+                x = pool2d(x, layer['size'], layer['strides'], layer['padding'], np.mean)
+            elif kind == 'gap':
+                x = x.mean(axis=(1, 2))
+            elif kind == 'flatten':
+                x = x.reshape(len(x), -1)
+            elif kind == 'dense':
+                x = x @ self.weights[f"{i}_kernel"] + self.weights[f"{i}_bias"]
+            x = activate(x, layer.get('activation'))
+        return x
+
+
+class TFLiteModel:
+    """The same interface over a .tflite file, with tflite_runtime or TensorFlow's interpreter"""
+
+    def __init__(self, path):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=path)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self.input['shape'][1:])
+        self._batch = 1
+
+    def predict(self, batch):
+        if len(batch) != self._batch:
+            self.interpreter.resize_tensor_input(self.input['index'], [len(batch), *self.input_shape])
+            self.interpreter.allocate_tensors()
+            self._batch = len(batch)
+        self.interpreter.set_tensor(self.input['index'], batch.astype(self.input['dtype']))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output['index'])
+
+
+def export_keras(model, path):
+    """Write a Keras model as victim_model.npz for NumpyModel, ValueError on layers it cannot run"""
+    layers = [{'type': 'input', 'input_shape': [int(d) for d in model.input_shape[1:]]}]
+    weights = {}
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+        i = len(layers)
+        if kind in SKIPPED_LAYERS:
+            continue
+        if kind == 'Rescaling':
+            layers.append({'type': 'rescale', 'scale': float(config['scale']), 'offset': float(config['offset'])})
+        elif kind == 'Conv2D':
+            if tuple(config.get('dilation_rate', (1, 1))) != (1, 1) or config.get('groups', 1) != 1:
+                raise ValueError(f"{layer.name}: dilated or grouped convolutions are not supported")
+            kernel, *bias = layer.get_weights()
+            weights[f"{i}_kernel"] = kernel
+            weights[f"{i}_bias"] = bias[0] if bias else np.zeros(kernel.shape[-1], dtype=kernel.dtype)
+            layers.append({'type': 'conv2d', 'strides': list(config['strides']), 'padding': config['padding'],
+                           'activation': config['activation']})
+        elif kind in ('MaxPooling2D', 'AveragePooling2D'):
+            layers.append({'type': 'maxpool' if kind == 'MaxPooling2D' else 'avgpool',
+                           'size': list(config['pool_size']), 'strides': list(config['strides'] or config['pool_size']),
+                           'padding': config['padding']})
+        elif kind == 'GlobalAveragePooling2D':
+            layers.append({'type': 'gap'})
+        elif kind == 'Flatten':
+            layers.append({'type': 'flatten'})
+        elif kind == 'Dense':
+            kernel, *bias = layer.get_weights()
+            weights[f"{i}_kernel"] = kernel
+            weights[f"{i}_bias"] = bias[0] if bias else np.zeros(kernel.shape[-1], dtype=kernel.dtype)
+            layers.append({'type': 'dense', 'activation': config['activation']})
+        elif kind == 'Activation':
+            layers.append({'type': 'activation', 'activation': config['activation']})
+        elif kind == 'BatchNormalization':
+            gamma, beta, mean, variance = layer.get_weights()
+            scale = gamma / np.sqrt(variance + config['epsilon'])
+            weights[f"{i}_scale"] = scale
+            weights[f"{i}_offset"] = beta - mean * scale
+            layers.append({'type': 'affine'})
+        else:
+            raise ValueError(f"{layer.name}: {kind} layers are not supported by the NumPy runtime")
+    np.savez(path, config=json.dumps(layers), **weights)
+
+
+def convert_keras(keras_path, model_dir, basename=MODEL_BASENAME):
+    """One-off conversion of a Keras model to the NumPy format, or to TFLite if it has other layers"""
+    import tensorflow as tf     # Only ever imported here, on the loader thread
+    model = tf.keras.models.load_model(keras_path, compile=False)
+    try:
+        path = os.path.join(model_dir, basename + ".npz")
+        export_keras(model, path)
+    except ValueError as e:
+        print(f"[CLASSIFIER] {e}, converting to TFLite instead")
+        path = os.path.join(model_dir, basename + ".tflite")
+        with open(path, 'wb') as f:
+            f.write(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+    print(f"[CLASSIFIER] Converted {keras_path} to {path}")
+    return path
+
+
+class VictimClassifier:
+    """Victim letter classifier (labels.txt) loaded and warmed up off the control path
+
+    start() loads the model on a background thread, converting a Keras
+    model to the NumPy (or TFLite) runtime once, and runs one dummy batch
+    so the first real call is not slow. Until then classify() returns
+    None and the controller keeps its default report. Crops are
+    classified as one batch per call.
+    """
+
+    def __init__(self, model_dir, labels_path, basename=MODEL_BASENAME, min_confidence=MIN_CONFIDENCE):
+        self.model_dir = model_dir
+        self.labels_path = labels_path
+        self.basename = basename
+        self.min_confidence = min_confidence
+        self.model = None
+        self.labels = []
+        self.error = None
+        self._visible = None            # Output slots of classes that can be reported
+        self._visible_labels = []
+        self.calls = 0
+        self.crops = 0
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="victim-classifier", daemon=True)
+            self._thread.start()
+
+    def find_model(self):
+        for ext in (".npz", ".tflite", ".keras", ".h5"):
+            path = os.path.join(self.model_dir, self.basename + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _load(self):
+        try:
+            path = self.find_model()
+            if path is None:
+                print(f"[CLASSIFIER] No {self.basename} model in {self.model_dir}, victims get the default type")
+                return
+            if path.endswith((".keras", ".h5")):
+                path = convert_keras(path, self.model_dir, self.basename)
+            model = NumpyModel(path) if path.endswith(".npz") else TFLiteModel(path)
+            labels = load_labels(self.labels_path)
+            model.predict(np.zeros((1, *model.input_shape), dtype=np.float32))     # Warm-up
+            self.model, self.labels = model, labels
+            self._visible = np.array([not label.startswith('.') for label in labels])
+            self._visible_labels = [label for label in labels if not label.startswith('.')]
+            self._ready.set()
+            print(f"[CLASSIFIER] {os.path.basename(path)} ready, classes {self._visible_labels}")
+        except Exception as e:
+            self.error = e
+            print(f"[CLASSIFIER] Could not load the victim model: {e}")
+
+    def preprocess(self, crops):
+        """Resize BGRA/BGR uint8 crops (nearest neighbour) into one float RGB batch of the model input size"""
+        height, width, channels = self.model.input_shape
+        batch = np.empty((len(crops), height, width, channels), dtype=np.float32)
+        for n, crop in enumerate(crops):
+            rows = np.arange(height) * crop.shape[0] // height
+            cols = np.arange(width) * crop.shape[1] // width
+            rgb = crop[rows[:, None], cols, 2::-1]
+            batch[n] = rgb.mean(axis=-1, keepdims=True) if channels == 1 else rgb
+        return batch
+
+    def classify(self, crops):
+        """[(label, confidence), ...] per crop, label None below min_confidence; None while not ready"""
+        if not self._ready.is_set() or not crops:
+            return None
+        self.calls += 1
+        self.crops += len(crops)
+        scores = np.asarray(self.model.predict(self.preprocess(crops)), dtype=np.float64)[:, self._visible]
+        if (scores >= 0).all() and (scores.sum(axis=1) <= 1.0 + 1e-3).all():
+            # Softmax output: renormalise without the hidden classes
+            probabilities = scores / np.maximum(scores.sum(axis=1, keepdims=True), np.finfo(float).tiny)
+        else:
+            probabilities = activate(scores, 'softmax')     # Logits
+        results = []
+        for row in probabilities:
+            index = int(row.argmax())
+            confidence = float(row[index])
+            results.append((self._visible_labels[index] if confidence >= self.min_confidence else None, confidence))
+        return results
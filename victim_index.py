@@ -0,0 +1,86 @@
+import math
+
+# Deduplication Constants
+DEFAULT_MERGE_RADIUS = 0.06     # Metres within which two sightings are the same victim
+VICTIM_MERGE_RADIUS = {         # Per victim type overrides
+    'H': 0.06,
+    'S': 0.06,
+    'U': 0.06,
+}
+
+
+class VictimRecord:
+    """A reported victim, refined in place by later sightings"""
+
+    def __init__(self, x, z, type_code, victim_id):
+        self.x = x
+        self.z = z
+        self.type_code = type_code
+        self.victim_id = victim_id
+        self.sightings = 1
+
+    def observe(self, x, z):
+        """Fold another sighting into the running mean position, see SpatialVictimIndex.observe"""
+        self.sightings += 1
+        self.x += (x - self.x) / self.sightings
+        self.z += (z - self.z) / self.sightings
+
+    def distance_to(self, x, z):
+        return math.hypot(self.x - x, self.z - z)
+
+
+class SpatialVictimIndex:
+    """Uniform grid hash of reported victims.
+
+    Cells are as wide as the largest merge radius, so any report within
+    that radius is in the 3x3 block around the query cell and a lookup is
+    O(1) on average regardless of how many victims were reported.
+    """
+
+    def __init__(self, merge_radius=None, default_radius=DEFAULT_MERGE_RADIUS):
+        self.merge_radius = dict(VICTIM_MERGE_RADIUS if merge_radius is None else merge_radius)
+        self.default_radius = default_radius
+        self.cell_size = max([default_radius] + list(self.merge_radius.values()))
+        self.cells = {}
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def _cell(self, x, z):
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def radius_for(self, type_code):
+        return self.merge_radius.get(type_code, self.default_radius)
+
+    def find(self, x, z, type_code):
+        """Closest record of the same type within its merge radius, or None"""
+        radius = self.radius_for(type_code)
+        cx, cz = self._cell(x, z)
+        best, best_dist = None, radius
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cz - 1, cz, cz + 1):
+                for record in self.cells.get((i, j), ()):
+                    if record.type_code != type_code:
+                        continue
+                    dist = record.distance_to(x, z)
+                    if dist <= best_dist:
+                        best, best_dist = record, dist
+        return best
+
+    def add(self, x, z, type_code):
+        record = VictimRecord(x, z, type_code, len(self.records) + 1)
+        self.cells.setdefault(self._cell(x, z), []).append(record)
+        self.records.append(record)
+        return record
+
+    def observe(self, record, x, z):
+        """Fold a sighting into record, moving it to the cell its mean position now falls in"""
+        old_cell = self._cell(record.x, record.z)
+        record.observe(x, z)
+        new_cell = self._cell(record.x, record.z)
+        if new_cell != old_cell:
+            self.cells[old_cell].remove(record)
+            if not self.cells[old_cell]:
+                del self.cells[old_cell]
+            self.cells.setdefault(new_cell, []).append(record)
@@ -0,0 +1,131 @@
+import argparse
+import csv
+import json
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from phrase_catalog import PhraseCatalog
+from report_writer import REPORT_HEADER
+
+# Binary Victim Log Constants
+LOG_MAGIC = b"VLOG"
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct("<4sHH")                 # magic, version, record size
+LOG_RECORD = struct.Struct("<ddfffBBBBH")           # see LOG_DTYPE for the field names
+LOG_DTYPE = np.dtype([
+    ("sim_time", "<f8"),        # Robot.getTime() of the report [s]
+    ("wall_time", "<f8"),       # Unix time of the report, used for the CSV timestamp
+    ("x", "<f4"),               # [m]
+    ("z", "<f4"),               # [m]
+    ("proximity", "<f4"),       # Distance from the robot [m]
+    ("type", "u1"),             # Index into TYPE_CODES
+    ("hazard", "u1"),           # Index into HAZARD_CODES
+    ("zone", "u1"),             # Zone-N
+    ("flags", "u1"),            # Reserved
+    ("area", "<u2"),            # Area code number (victim count)
+])
+assert LOG_DTYPE.itemsize == LOG_RECORD.size
+
+TYPE_CODES = ('H', 'S', 'U', 'F', 'P')
+HAZARD_CODES = (None, 'Flammable Gas', 'Organic Peroxide', 'Corrosive', 'Poison')
+UNKNOWN_CODE = 255
+
+
+def _encode(value, codes):
+    try:
+        return codes.index(value)
+    except ValueError:
+        return UNKNOWN_CODE
+
+
+def _decode(code, codes):
+    return codes[code] if code < len(codes) else "Unknown"
+
+
+class VictimLog:
+    """Append-only binary victim log with fixed-width records.
+
+    The file starts with a small header followed by LOG_RECORD entries, so
+    it can be memory-mapped with read_log() for fast post-mission scans.
+    Use the command line exporter to regenerate victim_report.csv from it.
+    """
+
+    def __init__(self, log_path, append=True):
+        self.log_path = log_path
+        new_file = not append or not os.path.exists(log_path) or os.path.getsize(log_path) == 0
+        self._file = open(log_path, 'ab' if append else 'wb')
+        if new_file:
+            self._file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, LOG_RECORD.size))
+            self._file.flush()
+
+    def append(self, sim_time, x, z, type_code, hazard_tag, proximity, zone, area, wall_time=None):
+        self._file.write(LOG_RECORD.pack(
+            sim_time, datetime.now().timestamp() if wall_time is None else wall_time,
+            x, z, proximity, _encode(type_code, TYPE_CODES), _encode(hazard_tag, HAZARD_CODES),
+            zone, 0, area))
+        # Reports are rare, so push each record to the OS right away to survive a reset
+        self._file.flush()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_log(log_path):
+    """Memory-map a victim log as a NumPy structured array"""
+    with open(log_path, 'rb') as f:
+        magic, version, record_size = LOG_HEADER.unpack(f.read(LOG_HEADER.size))
+    if magic != LOG_MAGIC or version != LOG_VERSION or record_size != LOG_DTYPE.itemsize:
+        raise ValueError(f"{log_path} is not a version {LOG_VERSION} victim log")
+    count = (os.path.getsize(log_path) - LOG_HEADER.size) // LOG_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=LOG_DTYPE)
+    return np.memmap(log_path, dtype=LOG_DTYPE, mode='r', offset=LOG_HEADER.size, shape=(count,))
+
+
+def export_rows(records, phrase_set, area_prefix="Area_Code"):
+    """Rebuild the victim_report.csv columns for every record"""
+    for record in records:
+        type_code = _decode(record["type"], TYPE_CODES)
+        hazard_tag = _decode(record["hazard"], HAZARD_CODES)
+        entry = phrase_set.priority(type_code)
+        yield [
+            round(float(record["x"]), 2), round(float(record["z"]), 2), type_code, entry.label,
+            hazard_tag or "None", round(float(record["proximity"]), 2),
+            datetime.fromtimestamp(float(record["wall_time"])).strftime("%m/%d/%Y %H:%M"),
+            f"{area_prefix}{int(record['area'])}", entry.urgency, f"Zone-{int(record['zone'])}",
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a binary victim log to CSV or JSON")
+    parser.add_argument("log", help="path to the binary victim log")
+    parser.add_argument("--phrases", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "phrases.json"),
+                        help="phrases.json used for priority labels and urgency messages")
+    parser.add_argument("--csv", help="write victim_report.csv style output here")
+    parser.add_argument("--json", help="write one JSON object per victim here")
+    parser.add_argument("--lang", default="en", help="language of the priority labels and urgency messages")
+    parser.add_argument("--area-prefix", default="Area_Code", help="prefix of the Area_Code column")
+    args = parser.parse_args()
+
+    phrases = PhraseCatalog(args.phrases, args.lang).current
+    rows = list(export_rows(read_log(args.log), phrases, args.area_prefix))
+
+    if args.csv:
+        with open(args.csv, mode='w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_HEADER)
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([dict(zip(REPORT_HEADER, row)) for row in rows], f, indent=2)
+    if not args.csv and not args.json:
+        print(f"{len(rows)} victims in {args.log}")
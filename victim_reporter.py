@@ -0,0 +1,121 @@
+import math
+import os
+from datetime import datetime
+
+from audio_cache import AudioCache
+from phrase_bank import PhraseBank
+from phrase_catalog import PhraseCatalog
+from report_writer import VictimReportWriter
+from speaker_scheduler import report_priority
+from speech_backend import GTTSBackend
+from speech_worker import SpeechWorker
+from victim_index import SpatialVictimIndex
+from victim_log import VictimLog
+
+VICTIM_LOG_FILENAME = "victim_log.bin"
+
+
+class VictimReporter:
+    """Deduplicates, logs and speaks victim reports for one robot.
+
+    Shared by V2.py and the standalone reporting controllers. It only needs
+    a robot with "gps" and "speaker" devices, so it can also be driven by
+    the stand-in devices in bench_reporting.py.
+    """
+
+    def __init__(self, robot, phrases_path, audio_folder, csv_path, language='en', area_prefix="Area_Code",
+                 append_csv=False, backend=None, preempt=True):
+        self.robot = robot
+        self.gps = robot.getDevice("gps")
+        self.speaker = robot.getDevice("speaker")
+        self.area_prefix = area_prefix
+        self.reports = 0
+        self.duplicates = 0
+
+        # Synthesized audio is kept between runs; stale files are cleaned up in the background
+        self.audio_cache = AudioCache(audio_folder)
+        self.audio_cache.cleanup_async()
+        self.victim_index = SpatialVictimIndex()
+        # Compiled once; other languages (phrases.<lang>.json) load on first use
+        self.phrases = PhraseCatalog(phrases_path, language)
+        # Fixed report phrases are rendered once and reused for every report
+        self.speech_backend = backend or GTTSBackend(language)
+        self.phrase_bank = PhraseBank(self.phrases, self.audio_cache, self.speech_backend)
+        self.phrase_bank.build_async()
+        self.speech = SpeechWorker(self.speaker, self.audio_cache, self.speech_backend, clock=robot.getTime,
+                                   phrase_bank=self.phrase_bank, preempt=preempt)
+        # One handle for the whole mission, rows are buffered and flushed periodically
+        self.report_writer = VictimReportWriter(csv_path, clock=robot.getTime, append=append_csv)
+        # Compact binary copy for post-mission analysis, export with victim_log.py
+        self.victim_log = VictimLog(os.path.join(os.path.dirname(csv_path), VICTIM_LOG_FILENAME))
+
+    def get_position(self):
+        pos = self.gps.getValues()
+        return pos[0], pos[2]  # in meters
+
+    def report_victim(self, x_cm, z_cm, type_code, hazard_tag, count):
+        """Report a victim, returns its record or None if it was already reported"""
+        x_m = round(x_cm / 100.0, 2)
+        z_m = round(z_cm / 100.0, 2)
+
+        # Sightings within the merge radius of an earlier report refine that report instead
+        existing = self.victim_index.find(x_cm / 100.0, z_cm / 100.0, type_code)
+        if existing is not None:
+            self.victim_index.observe(existing, x_cm / 100.0, z_cm / 100.0)
+            self.duplicates += 1
+            # Even for skipped, show distance in meters
+            robot_x, robot_z = self.get_position()
+            proximity_m = round(math.sqrt((x_m - robot_x) ** 2 + (z_m - robot_z) ** 2), 2)
+            print(f"[SKIPPED] Already reported: {type_code} #{existing.victim_id} at ({existing.x:.2f} m, {existing.z:.2f} m) | Distance: {proximity_m} m")
+            return None
+
+        record = self.victim_index.add(x_cm / 100.0, z_cm / 100.0, type_code)
+        self.reports += 1
+        robot_x, robot_z = self.get_position()
+        proximity_m = round(math.sqrt((x_m - robot_x) ** 2 + (z_m - robot_z) ** 2), 2)
+
+        # Priority logic and voice message
+        report = self.phrases.current.report(type_code, hazard_tag, x_m, z_m, proximity_m)
+        timestamp = datetime.now().strftime("%m/%d/%Y %H:%M")
+
+        # CSV meta info
+        area_code = f"{self.area_prefix}{count}"
+        zone_number = (count % 3) + 1
+        zone = f"Zone-{zone_number}"
+
+        # Console log
+        print(f"[COGNITIVE] Victim at ({x_m} m, {z_m} m) → {report.label}")
+        print(f"[DISTANCE] Proximity: {proximity_m} meters")
+        if hazard_tag:
+            print(f"[HAZARD] {hazard_tag} detected")
+
+        # Write to CSV (buffered, flushed by the report writer) and the binary log
+        self.report_writer.write_row([x_m, z_m, type_code, report.label, hazard_tag or "None", proximity_m, timestamp, area_code, report.urgency, zone])
+        self.victim_log.append(self.robot.getTime(), x_m, z_m, type_code, hazard_tag, proximity_m, zone_number, count)
+
+        # Synthesis happens on the speech worker thread, playback starts from tick()
+        self.speech.say(report.text, f"report_{count}", report.segments, priority=report_priority(report.rank, hazard_tag),
+                        language=self.phrases.language)
+        return record
+
+    def dedupe_hit_rate(self):
+        total = self.reports + self.duplicates
+        return self.duplicates / total if total else 0.0
+
+    def tick(self):
+        """Per-step housekeeping, cheap enough to call every timestep"""
+        # Speaker calls stay on the control thread, the controller library is not thread-safe
+        self.speech.tick(self.robot.getTime())
+        self.report_writer.maybe_flush()
+
+    def set_language(self, language):
+        """Switch report language at runtime, rendering its phrase clips in the background"""
+        # The backend is shared with the speech worker, so the language goes with each request instead
+        self.phrases.set_language(language)
+        self.phrase_bank.build_async()
+
+    def close(self):
+        """Write out buffered reports and stop the speech worker"""
+        self.report_writer.close()
+        self.victim_log.close()
+        self.speech.close(timeout=1.0)